@@ -0,0 +1,15 @@
+algoritmo = "a_star"
+verbose = True
+heuristicas = ["matching"]
+expansion = "empujes"
+mapa = """
+##########
+#   #    #
+# $   $  #
+#  ## ## #
+# .  @  .#
+#  ## ## #
+# $   $  #
+#.  #   .#
+##########
+"""
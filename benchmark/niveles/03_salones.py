@@ -0,0 +1,16 @@
+algoritmo = "a_star"
+verbose = True
+heuristicas = ["matching"]
+expansion = "empujes"
+mapa = """
+ ###########
+ #    #    #
+ # $  #  . #
+## $$   .. #
+#  @ ###   #
+# $  #   . #
+#    # $   #
+###  ### ###
+  #   .    #
+  ##########
+"""
@@ -0,0 +1,88 @@
+import time
+
+from .frontera import frontera_ponderada
+from .instrumentacion import Estadisticas, Presupuesto
+
+
+def recorre_anytime(root, config):
+    """A* anytime: corre A* ponderado (f = g + w * h) empezando con
+    `w = config.weight`, que llega rapido a una primera solucion, y lo repite
+    bajando el peso de a `config.weight_step` hasta 1. Cada nueva corrida
+    poda los estados con g + h mayor o igual al costo de la mejor solucion,
+    por lo que solo encuentra soluciones mas cortas.
+
+    Termina al completar la corrida con w = 1 o cuando una corrida agota la
+    frontera: con una heuristica admisible la ultima solucion es entonces
+    optima, tambien con `expansion = "empujes"` (los costos de la frontera se
+    guardan por casilla exacta del jugador). Las corridas comparten las estadisticas y el presupuesto; si se
+    excede, se devuelve la mejor solucion encontrada hasta ese momento.
+
+    Args:
+        root (Sokoban): estado inicial del juego.
+        config (module): configuración de la busqueda.
+
+    Yields:
+        dict: eventos de la busqueda (ver `recorre_arbol_iter`), con un
+        evento "mejora" por cada solucion mas corta; el ultimo tiene los
+        resultados, con las mejoras en "mejoras".
+    """
+    from .tree import _recorre_frontera
+
+    t_inicial = time.time()
+    heuristicas = getattr(config, "heuristicas", ["manhattan"])
+    peso = max(getattr(config, "weight", 2.0), 1.0)
+    paso = getattr(config, "weight_step", 0.5)
+    guardar_explorados = getattr(config, "guardar_explorados", False)
+    estadisticas = Estadisticas.desde_config(config)
+    presupuesto = Presupuesto(config)
+
+    solucion = None
+    mejoras = []
+    mejor_h = float("inf")
+    max_nivel_alcanzado = 0
+    estados_explorados = []
+
+    while True:
+        cota = solucion.g if solucion is not None else None
+        frontera = frontera_ponderada(heuristicas, peso)
+        for evento in _recorre_frontera(root, config, frontera, estadisticas, presupuesto, cota):
+            if evento["tipo"] == "mejor_h":
+                # cada corrida empieza de cero: solo se informan las mejoras
+                if evento["h"] >= mejor_h:
+                    continue
+                mejor_h = evento["h"]
+            if evento["tipo"] != "fin":
+                yield evento
+        results = evento["resultados"]
+        max_nivel_alcanzado = max(max_nivel_alcanzado, results["profundidad_maxima"])
+        if guardar_explorados:
+            estados_explorados += results["estados_explorados"]
+
+        if results["solucion"].is_finished():
+            solucion = results["solucion"]
+            mejora = {
+                "weight": peso, "costo": solucion.g,
+                "nodos_explorados": estadisticas.explorados, "tiempo": time.time() - t_inicial,
+            }
+            mejoras.append(mejora)
+            yield {"tipo": "mejora", **mejora}
+        # si la corrida no encontro solucion no hay ninguna mas corta
+        if not results["solucion"].is_finished() or results["presupuesto_excedido"] or peso <= 1.0:
+            break
+        peso = max(peso - paso, 1.0)
+
+    # sin solucion, el estado de la ultima corrida (el mas prometedor si se
+    # excedio el presupuesto)
+    if solucion is None:
+        solucion = results["solucion"]
+    results.update({
+        "tiempo": time.time() - t_inicial,
+        "profundidad_maxima": max_nivel_alcanzado,
+        "solucion": solucion,
+        "movimientos": solucion.movements,
+        "mejoras": mejoras,
+        "mejor_h": min(mejor_h, results["mejor_h"]),
+    })
+    if guardar_explorados:
+        results["estados_explorados"] = estados_explorados
+    yield {"tipo": "fin", "resultados": results}
@@ -0,0 +1,207 @@
+"""
+Benchmark reproducible de los algoritmos de busqueda.
+
+    python -m src.benchmark --salida actual.json
+    python -m src.benchmark --comparar base.json actual.json
+
+Corre cada combinacion de nivel, algoritmo, heuristicas y expansion sobre los
+niveles de `config/` y `benchmark/niveles/`, cada una en un proceso nuevo para
+medir su pico de memoria, y guarda los resultados en JSON. El modo de
+comparacion marca las regresiones contra un resultado guardado.
+"""
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from .instrumentacion import memoria_pico_mb
+from .solve import generar_tareas, resolver_tarea
+
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+NIVELES = sorted(glob.glob(os.path.join(RAIZ, "config", "*.py"))) + \
+    sorted(glob.glob(os.path.join(RAIZ, "benchmark", "niveles", "*.py")))
+
+ALGORITMOS = ["bfs", "dfs", "greedy", "a_star", "weighted_a_star", "anytime_a_star", "beam", "ida_star", "bidireccional"]
+HEURISTICAS = [["manhattan"], ["matching"]]
+EXPANSIONES = ["pasos", "empujes"]
+
+# algoritmos cuyo recorrido no depende de la heuristica
+SIN_HEURISTICA = {"bfs", "dfs", "bidireccional"}
+
+# una diferencia de tiempo menor a esta se considera ruido
+TIEMPO_MINIMO = 0.05
+
+
+def medir_tarea(tarea: dict) -> dict:
+    """Resuelve una tarea midiendo su memoria. Se ejecuta en un proceso nuevo
+    para que el pico de RSS corresponda solo a esta tarea.
+
+    Args:
+        tarea (dict): tarea de `generar_tareas` con el campo adicional
+        `tracemalloc` (bool)
+
+    Returns:
+        dict: resultado de `resolver_tarea` con nodos por segundo y picos de
+        memoria en MB
+    """
+    if tarea["tracemalloc"]: tracemalloc.start()
+    resultado = resolver_tarea(tarea)
+    if tarea["tracemalloc"]:
+        resultado["tracemalloc_max_mb"] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        tracemalloc.stop()
+    pico = memoria_pico_mb()
+    if pico is not None:
+        resultado["rss_max_mb"] = pico
+    if "tiempo" in resultado:
+        resultado["nodos_por_segundo"] = resultado["nodos_generados"] / max(resultado["tiempo"], 1e-9)
+    return resultado
+
+
+def correr_benchmark(niveles=NIVELES, algoritmos=ALGORITMOS, heuristicas=HEURISTICAS,
+                     expansiones=EXPANSIONES, timeout=60, repeticiones=1, jobs=1,
+                     medir_tracemalloc=False) -> dict:
+    """Corre la matriz completa del benchmark.
+
+    Con `repeticiones` > 1 cada tarea se corre varias veces y se informa la
+    mediana del tiempo. Por defecto se usa un solo proceso a la vez para no
+    mezclar las mediciones.
+
+    Args:
+        niveles (list): archivos de configuración con los mapas
+        algoritmos (list): algoritmos a medir
+        heuristicas (list): combinaciones de heuristicas
+        expansiones (list): expansiones a medir ("pasos", "empujes")
+        timeout (float): limite de segundos por corrida
+        repeticiones (int): corridas por tarea
+        jobs (int): procesos en paralelo
+        medir_tracemalloc (bool): medir el pico de memoria de Python (lento)
+
+    Returns:
+        dict: metadatos de la maquina y lista de resultados
+    """
+    tareas = []
+    for expansion in expansiones:
+        for tarea in generar_tareas(niveles, algoritmos, heuristicas, expansion, timeout=timeout):
+            if tarea["algoritmo"] in SIN_HEURISTICA and tarea["heuristicas"] != heuristicas[0]:
+                continue
+            tarea["tracemalloc"] = medir_tracemalloc
+            tareas.append(tarea)
+
+    # un proceso nuevo por corrida
+    with multiprocessing.Pool(jobs, maxtasksperchild=1) as pool:
+        corridas = pool.map(medir_tarea, [t for t in tareas for _ in range(repeticiones)], chunksize=1)
+
+    resultados = []
+    for i in range(0, len(corridas), repeticiones):
+        resultado = corridas[i]
+        tiempos = [c["tiempo"] for c in corridas[i:i + repeticiones] if "tiempo" in c]
+        if tiempos:
+            resultado["tiempo"] = statistics.median(tiempos)
+            resultado["tiempos"] = tiempos
+        resultado["nivel"] = os.path.relpath(resultado["nivel"], RAIZ)
+        resultados.append(resultado)
+
+    return {
+        "fecha": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def _clave(resultado: dict) -> tuple:
+    return (
+        resultado["nivel"], resultado["algoritmo"], tuple(resultado["heuristicas"] or ()),
+        resultado["expansion"], resultado["backend"],
+    )
+
+
+def comparar(base: dict, actual: dict, tolerancia: float = 0.1) -> list:
+    """Compara dos corridas del benchmark.
+
+    Se considera regresion que una tarea resuelta deje de resolverse, que
+    explore mas nodos, que su solucion sea mas larga o que tarde mas que el
+    tiempo base mas la tolerancia.
+
+    Args:
+        base (dict): resultados de referencia
+        actual (dict): resultados nuevos
+        tolerancia (float): aumento de tiempo relativo admitido
+
+    Returns:
+        list: descripcion de cada regresion encontrada
+    """
+    anteriores = {_clave(r): r for r in base["resultados"]}
+    regresiones = []
+    for nuevo in actual["resultados"]:
+        previo = anteriores.get(_clave(nuevo))
+        if previo is None or previo["estado"] != "resuelto":
+            continue
+        nombre = " ".join(str(c) for c in _clave(nuevo))
+        if nuevo["estado"] != "resuelto":
+            regresiones.append("{}: {}".format(nombre, nuevo["estado"]))
+            continue
+        if nuevo["nodos_explorados"] > previo["nodos_explorados"]:
+            regresiones.append("{}: nodos {} -> {}".format(
+                nombre, previo["nodos_explorados"], nuevo["nodos_explorados"]))
+        if nuevo["longitud"] > previo["longitud"]:
+            regresiones.append("{}: longitud {} -> {}".format(nombre, previo["longitud"], nuevo["longitud"]))
+        if nuevo["tiempo"] > previo["tiempo"] * (1 + tolerancia) + TIEMPO_MINIMO:
+            regresiones.append("{}: tiempo {:.3f}s -> {:.3f}s".format(nombre, previo["tiempo"], nuevo["tiempo"]))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark de los algoritmos de busqueda.")
+    parser.add_argument("--niveles", nargs="+", default=NIVELES)
+    parser.add_argument("--algo", nargs="+", dest="algoritmos", default=ALGORITMOS)
+    parser.add_argument("--heuristicas", nargs="+", help="combinaciones separadas por coma")
+    parser.add_argument("--expansion", nargs="+", dest="expansiones", default=EXPANSIONES)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--repeticiones", type=int, default=1)
+    parser.add_argument("--jobs", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true", help="medir memoria con tracemalloc")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", nargs="+", metavar="JSON",
+                        help="resultados base y, opcionalmente, actuales (si no se corre el benchmark)")
+    parser.add_argument("--tolerancia", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    if args.comparar and len(args.comparar) > 1:
+        with open(args.comparar[1]) as f:
+            actual = json.load(f)
+    else:
+        heuristicas = [h.split(",") for h in args.heuristicas] if args.heuristicas else HEURISTICAS
+        actual = correr_benchmark(
+            args.niveles, args.algoritmos, heuristicas, args.expansiones, args.timeout,
+            args.repeticiones, args.jobs, args.tracemalloc,
+        )
+        for r in actual["resultados"]:
+            print("{:32} {:14} {:22} {:8} {:15} {:>8} {:>8}".format(
+                r["nivel"], r["algoritmo"], ",".join(r["heuristicas"]), r["expansion"], r["estado"],
+                "{:.3f}".format(r["tiempo"]) if "tiempo" in r else "-", r.get("nodos_explorados", "-"),
+            ))
+        if args.salida:
+            with open(args.salida, "w") as f:
+                json.dump(actual, f, indent=1)
+
+    if args.comparar:
+        with open(args.comparar[0]) as f:
+            base = json.load(f)
+        regresiones = comparar(base, actual, args.tolerancia)
+        for regresion in regresiones:
+            print("REGRESION", regresion)
+        return 1 if regresiones else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+import itertools
+import time
+from collections import deque
+
+from .instrumentacion import Presupuesto
+from .sokoban import Sokoban, crear_verificador
+
+
+# letra del empuje que deshace un tiron en cada direccion
+OPUESTO = {"u": "d", "d": "u", "l": "r", "r": "l"}
+
+
+class EstadoInverso:
+    """
+    Estado de la busqueda hacia atras. Guarda las cajas, la posicion del
+    jugador y el tiron que lo genero: la caja que estaba en `box` se movio en
+    la direccion `move`. El hash de Zobrist de las cajas se actualiza en cada
+    tiron igual que en `Sokoban`.
+    """
+
+    __slots__ = ("player", "boxes", "parent", "box", "move", "hash_cajas")
+
+    def __init__(self, player, boxes, hash_cajas, parent=None, box=None, move=None):
+        self.player = player
+        self.boxes = boxes
+        self.hash_cajas = hash_cajas
+        self.parent = parent
+        self.box = box
+        self.move = move
+
+    def as_sokoban(self, nivel):
+        """Estado equivalente (sin historia) para reusar la logica de `Sokoban`."""
+        return Sokoban(nivel, self.player, self.boxes, hash_cajas=self.hash_cajas)
+
+    def get_pulls(self, nivel):
+        """Devuelve los estados que resultan de tirar de una caja: el
+        jugador, parado junto a la caja, retrocede una celda y la arrastra.
+
+        Args:
+            nivel (Nivel): parte estatica del tablero
+
+        Returns:
+            list: estados previos posibles
+        """
+        paredes = nivel.paredes
+        alcanzables = self.as_sokoban(nivel)._reachable()
+        zobrist = nivel.zobrist_cajas
+        previos = []
+        for box in self.boxes:
+            for move, d in nivel.direcciones.items():
+                destino, retroceso = box + d, box + 2 * d
+                if destino not in alcanzables or paredes[retroceso] or retroceso in self.boxes:
+                    continue
+                boxes = tuple(sorted(destino if b == box else b for b in self.boxes))
+                hash_cajas = self.hash_cajas ^ zobrist[box] ^ zobrist[destino]
+                previos.append(EstadoInverso(retroceso, boxes, hash_cajas, self, box, move))
+        return previos
+
+    def get_key(self, nivel):
+        """Clave con la menor celda alcanzable por el jugador, igual a
+        `Sokoban.get_key(normalizado=True)`.
+        """
+        return self.as_sokoban(nivel).get_key(normalizado=True)
+
+
+def _estados_finales(root):
+    """Estados finales de la busqueda hacia atras: las cajas sobre los goals y
+    el jugador en cada una de las regiones libres que quedan.
+
+    Args:
+        root (Sokoban): estado inicial del juego
+
+    Returns:
+        list: estados inversos iniciales
+    """
+    nivel = root.nivel
+    interior = Sokoban(nivel, root._player, ())._reachable()
+    finales = []
+    for boxes in itertools.combinations(sorted(nivel.goals), len(root._box_indices())):
+        libres = set(interior) - set(boxes)
+        while libres:
+            player = min(libres)
+            libres -= set(Sokoban(nivel, player, boxes)._reachable())
+            finales.append(EstadoInverso(player, boxes, nivel.hash_cajas(boxes)))
+    return finales
+
+
+def _unir(adelante, atras):
+    """Une las dos mitades de la busqueda: a partir del estado alcanzado hacia
+    adelante, deshace los tirones del estado inverso en orden, caminando
+    hasta cada caja y empujandola.
+
+    Args:
+        adelante (Sokoban): estado de encuentro de la busqueda hacia adelante
+        atras (EstadoInverso): estado de encuentro de la busqueda hacia atras
+
+    Returns:
+        Sokoban: estado final, con los movimientos completos desde la raiz
+    """
+    state = adelante
+    nivel = adelante.nivel
+    while atras.parent is not None:
+        d = nivel.direcciones[atras.move]
+        # el jugador estaba detras de la caja movida y la empuja de vuelta
+        camino = state._path_to(state._reachable(), atras.box + 2 * d)
+        state = state.apply_moves(camino + OPUESTO[atras.move])
+        atras = atras.parent
+    return state
+
+
+def bidireccional(root, config):
+    """Busqueda bidireccional por empujes. Hacia adelante se empujan cajas
+    desde el estado inicial y hacia atras se tira de ellas desde las cajas
+    sobre los goals (con el jugador en cada region posible). Ambas mitades
+    comparten un indice por clave y, al encontrarse, se unen en una unica
+    secuencia de movimientos. Cada paso expande el nivel completo de la
+    frontera mas chica.
+
+    Al exceder el presupuesto devuelve el estado inicial, ya que esta
+    busqueda no evalua heuristicas.
+
+    Args:
+        root (Sokoban): estado inicial del juego.
+        config (module): configuración de la busqueda.
+
+    Returns:
+        dict: resultados de la busqueda.
+    """
+    t_inicial = time.time()
+    nivel = root.nivel
+    root = root.as_root()
+    verificar = crear_verificador(config, normalizado=True)
+    presupuesto = Presupuesto(config)
+    excedido = None
+
+    frontera_adelante = deque([root])
+    adelante = {root.get_key(normalizado=True): root}
+    frontera_atras = deque(_estados_finales(root))
+    atras = {state.get_key(nivel): state for state in frontera_atras}
+
+    nodos_adelante = 0
+    nodos_atras = 0
+    nodos_generados = 0
+    max_nivel_alcanzado = 0
+    encuentro = None
+    if root.get_key(normalizado=True) in atras:
+        encuentro = (root, atras[root.get_key(normalizado=True)])
+
+    while encuentro is None and not excedido and frontera_adelante and frontera_atras:
+        if len(frontera_adelante) <= len(frontera_atras):
+            for _ in range(len(frontera_adelante)):
+                excedido = presupuesto.excedido(nodos_adelante + nodos_atras)
+                if excedido: break
+                current = frontera_adelante.popleft()
+                nodos_adelante += 1
+                max_nivel_alcanzado = max(max_nivel_alcanzado, current.g)
+                sucesores = current.get_possible_pushes()
+                nodos_generados += len(sucesores)
+                for new_state in sucesores:
+                    if new_state.is_deadlocked(incremental=True): continue
+                    key = new_state.get_key(normalizado=True)
+                    if verificar: verificar(new_state)
+                    if key in adelante: continue
+                    adelante[key] = new_state
+                    if key in atras:
+                        encuentro = (new_state, atras[key])
+                        break
+                    frontera_adelante.append(new_state)
+                if encuentro: break
+        else:
+            for _ in range(len(frontera_atras)):
+                excedido = presupuesto.excedido(nodos_adelante + nodos_atras)
+                if excedido: break
+                current = frontera_atras.popleft()
+                nodos_atras += 1
+                previos = current.get_pulls(nivel)
+                nodos_generados += len(previos)
+                for new_state in previos:
+                    key = new_state.get_key(nivel)
+                    if verificar: verificar(new_state.as_sokoban(nivel))
+                    if key in atras: continue
+                    atras[key] = new_state
+                    if key in adelante:
+                        encuentro = (adelante[key], new_state)
+                        break
+                    frontera_atras.append(new_state)
+                if encuentro: break
+
+    solucion = _unir(*encuentro) if encuentro else root
+    if config.verbose and excedido: print("Presupuesto excedido: {}".format(excedido))
+    if config.verbose and encuentro: print("Solucion Encontrada")
+
+    return {
+        "tiempo": time.time() - t_inicial,
+        "nodos_explorados": nodos_adelante + nodos_atras,
+        "nodos_generados": nodos_generados,
+        "nodos_adelante": nodos_adelante,
+        "nodos_atras": nodos_atras,
+        "profundidad_maxima": max_nivel_alcanzado,
+        "solucion": solucion,
+        "movimientos": solucion.movements,
+        "presupuesto_excedido": excedido,
+    }
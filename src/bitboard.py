@@ -0,0 +1,165 @@
+from .nivel import Nivel
+from .sokoban import Sokoban
+
+
+def _desplazar(mascara: int, d: int) -> int:
+    """Desplaza un bitboard `d` casillas (hacia indices mayores si d > 0)."""
+    return mascara << d if d > 0 else mascara >> -d
+
+
+def _indices(mascara: int) -> tuple:
+    """Indices ordenados de los bits en 1 de un bitboard."""
+    indices = []
+    while mascara:
+        bit = mascara & -mascara
+        indices.append(bit.bit_length() - 1)
+        mascara ^= bit
+    return tuple(indices)
+
+
+class SokobanBitboard(Sokoban):
+    """
+    Estado del Sokoban con las cajas codificadas como un bitboard: un entero
+    con el bit `p` en 1 si hay una caja en la casilla de indice lineal `p`.
+    Las paredes, los goals y las casillas muertas del nivel tambien se usan
+    como bitboards, por lo que los movimientos, la validez de los empujes y
+    las verificaciones de fin de juego y deadlock son desplazamientos y
+    mascaras de bits.
+
+    Tiene la misma interfaz publica que `Sokoban`. Se elige con
+    `config.backend = "bitboard"`.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, nivel=None, player=None, boxes=0, parent=None, last_move="", g=0,
+                 moved_box=None, hash_cajas=None):
+        if hash_cajas is None and nivel is not None:
+            hash_cajas = nivel.hash_cajas(_indices(boxes))
+        super().__init__(nivel, player, boxes, parent, last_move, g, moved_box, hash_cajas)
+
+    @staticmethod
+    def _codificar_cajas(indices) -> int:
+        return Nivel.mascara(indices)
+
+    def _box_indices(self) -> tuple:
+        return _indices(self._boxes)
+
+    def _has_box(self, p: int) -> bool:
+        return self._boxes >> p & 1 == 1
+
+    def parse_grid(self, grid: str, tablas=None):
+        super().parse_grid(grid, tablas)
+        self._boxes = self._codificar_cajas(self._boxes)
+
+    def _move(self, x: int, y: int, move: str):
+        nivel = self.nivel
+        d = x * nivel.cols + y
+        p = self._player + d
+        bit = 1 << p
+        paredes = nivel.mascara_paredes
+
+        if paredes & bit:
+            return
+
+        boxes = self._boxes
+        moved_box = None
+        hash_cajas = self._hash_cajas
+        if boxes & bit:
+            q = p + d
+            destino = 1 << q
+            if (paredes | boxes) & destino:
+                return
+            boxes ^= bit | destino
+            moved_box = q
+            hash_cajas ^= nivel.zobrist_cajas[p] ^ nivel.zobrist_cajas[q]
+
+        return SokobanBitboard(nivel, p, boxes, self, move, self.g + 1, moved_box, hash_cajas)
+
+    def _reachable_mask(self) -> int:
+        """Region alcanzable por el jugador, calculada expandiendo el
+        bitboard en las cuatro direcciones hasta que no crece mas.
+
+        Returns:
+            int: bitboard de las casillas alcanzables
+        """
+        cols = self.nivel.cols
+        libres = self.nivel.mascara_piso & ~self._boxes
+        region = 1 << self._player
+        while True:
+            nueva = (region | region << 1 | region >> 1 | region << cols | region >> cols) & libres
+            if nueva == region:
+                return region
+            region = nueva
+
+    def _reachable(self) -> dict:
+        libres = self.nivel.mascara_piso & ~self._boxes
+        direcciones = self.nivel.direcciones.items()
+        previo = {self._player: (None, "")}
+        pendientes = [self._player]
+        for p in pendientes:
+            for move, d in direcciones:
+                q = p + d
+                if q in previo or not libres >> q & 1:
+                    continue
+                previo[q] = (p, move)
+                pendientes.append(q)
+        return previo
+
+    def _get_player_key(self, normalizado: bool) -> int:
+        if not normalizado:
+            return self._player
+        if self._region is None:
+            region = self._reachable_mask()
+            self._region = (region & -region).bit_length() - 1
+        return self._region
+
+    def get_possible_pushes(self) -> list:
+        nivel = self.nivel
+        boxes = self._boxes
+        region = self._reachable_mask()
+        libres = nivel.mascara_piso & ~boxes
+        # por direccion, cajas con el jugador detras y lugar libre adelante
+        empujables = [
+            (move, d, boxes & _desplazar(region, d) & _desplazar(libres, -d))
+            for move, d in nivel.direcciones.items()
+        ]
+
+        zobrist = nivel.zobrist_cajas
+        previo = None
+        sucesores = []
+        for box in _indices(boxes):
+            bit = 1 << box
+            for move, d, mascara in empujables:
+                if not mascara & bit:
+                    continue
+                if previo is None:
+                    previo = self._reachable()
+                destino = box + d
+                camino = self._path_to(previo, box - d) + move
+                hash_cajas = self._hash_cajas ^ zobrist[box] ^ zobrist[destino]
+                sucesores.append(SokobanBitboard(
+                    nivel, box, boxes ^ bit ^ (1 << destino), self, camino,
+                    self.g + len(camino), destino, hash_cajas,
+                ))
+        return sucesores
+
+    def is_finished(self) -> bool:
+        return self._boxes & ~self.nivel.mascara_goals == 0
+
+    def is_deadlocked(self, incremental: bool = False) -> bool:
+        if not incremental and self._boxes & self.nivel.mascara_muertas:
+            return True
+        return super().is_deadlocked(incremental)
+
+    def _is_block_deadlock(self, box: int) -> bool:
+        nivel = self.nivel
+        cols = nivel.cols
+        ocupadas = nivel.mascara_paredes | self._boxes
+        fuera_de_goal = self._boxes & ~nivel.mascara_goals
+        patron = 3 | 3 << cols
+        for esquina in (box, box - 1, box - cols, box - cols - 1):
+            bloque = patron << esquina
+            if ocupadas & bloque == bloque and fuera_de_goal & bloque:
+                return True
+        return False
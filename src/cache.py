@@ -0,0 +1,233 @@
+"""
+Cache persistente de soluciones en SQLite.
+
+Cada entrada se identifica por un hash canonico del nivel ya parseado
+(paredes, goals, cajas y jugador) y por los ajustes de la busqueda que
+cambian su resultado. Guarda los movimientos y las estadisticas de la
+busqueda, y al leerla se valida reproduciendo los movimientos.
+
+    python -m src.cache info
+    python -m src.cache invalidar [config/01_basico.py ...]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+
+# ubicacion por defecto, se puede cambiar con la variable de entorno SOKOBAN_CACHE
+RUTA_DEFECTO = os.environ.get(
+    "SOKOBAN_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "sokoban", "soluciones.sqlite")
+)
+
+# campos de la configuración que definen el resultado de una busqueda
+CAMPOS_AJUSTES = (
+    "algoritmo", "heuristicas", "expansion", "portfolio", "portfolio_deadline", "tabla_transposicion",
+    "beam_width", "weight", "weight_step",
+)
+
+# resultados que no se guardan junto a los movimientos: los estados se
+# reconstruyen al leer la entrada
+NO_GUARDADOS = ("solucion", "movimientos", "estados_explorados", "perfil")
+
+# opciones cuyos resultados no se pueden recuperar de la cache
+SIN_CACHE = ("guardar_explorados", "perfilar")
+
+
+def hash_nivel(root) -> str:
+    """Hash canonico de un estado inicial: no depende del formato del mapa
+    (espacios o lineas sobrantes) sino del tablero parseado.
+
+    Args:
+        root (Sokoban): estado inicial
+
+    Returns:
+        str: hash hexadecimal
+    """
+    nivel = root.nivel
+    paredes = [p for p, pared in enumerate(nivel.paredes) if pared]
+    # posiciones relativas a la esquina de las paredes, sin el relleno del mapa
+    i0 = min((p // nivel.cols for p in paredes), default=0)
+    j0 = min((p % nivel.cols for p in paredes), default=0)
+
+    def relativas(indices):
+        return sorted((p // nivel.cols - i0, p % nivel.cols - j0) for p in indices)
+
+    canonico = "{}|{}|{}|{}".format(
+        relativas(paredes), relativas(nivel.goals), relativas(root._box_indices()), relativas([root._player]),
+    )
+    return hashlib.sha256(canonico.encode()).hexdigest()
+
+
+def clave_ajustes(config) -> str:
+    """Ajustes de la busqueda que forman parte de la clave, como JSON."""
+    return json.dumps({campo: getattr(config, campo, None) for campo in CAMPOS_AJUSTES}, sort_keys=True)
+
+
+class CacheSoluciones:
+    """
+    Cache de soluciones en un archivo SQLite con limite de tamaño. Al
+    superarlo se descartan las entradas usadas hace mas tiempo.
+    """
+
+    def __init__(self, ruta: str = RUTA_DEFECTO, max_mb: float = 64):
+        """
+        Args:
+            ruta (str): archivo de la base de datos
+            max_mb (float): tamaño maximo aproximado de las entradas en MB
+        """
+        self.ruta = ruta
+        self.max_bytes = max_mb * 2 ** 20
+        if os.path.dirname(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        # el timeout permite escrituras concurrentes desde varios procesos
+        self.conexion = sqlite3.connect(ruta, timeout=30)
+        self.conexion.execute(
+            "CREATE TABLE IF NOT EXISTS soluciones ("
+            " nivel TEXT, ajustes TEXT, movimientos TEXT, estadisticas TEXT,"
+            " tamano INTEGER, usado REAL, PRIMARY KEY (nivel, ajustes))"
+        )
+        self.conexion.commit()
+
+    def buscar(self, root, config):
+        """Busca la solucion de un nivel con los ajustes de la configuración.
+        Si los movimientos guardados no resuelven el nivel, la entrada se
+        descarta.
+
+        Args:
+            root (Sokoban): estado inicial
+            config (module): configuración de la busqueda
+
+        Returns:
+            dict: resultados como los de `recorre_arbol` (con "cache" en
+            True), None si no hay una entrada valida
+        """
+        clave = (hash_nivel(root), clave_ajustes(config))
+        fila = self.conexion.execute(
+            "SELECT movimientos, estadisticas FROM soluciones WHERE nivel = ? AND ajustes = ?", clave
+        ).fetchone()
+        if fila is None:
+            return None
+
+        movimientos, estadisticas = fila
+        solucion = root.as_root().apply_moves(movimientos)
+        if solucion is None or not solucion.is_finished():
+            self.conexion.execute("DELETE FROM soluciones WHERE nivel = ? AND ajustes = ?", clave)
+            self.conexion.commit()
+            return None
+
+        self.conexion.execute(
+            "UPDATE soluciones SET usado = ? WHERE nivel = ? AND ajustes = ?", (time.time(),) + clave
+        )
+        self.conexion.commit()
+        results = json.loads(estadisticas)
+        results.update({"solucion": solucion, "movimientos": movimientos, "cache": True})
+        return results
+
+    def guardar(self, root, config, results):
+        """Guarda los resultados de una busqueda, solo si encontro solucion.
+
+        Args:
+            root (Sokoban): estado inicial
+            config (module): configuración de la busqueda
+            results (dict): resultados de `recorre_arbol`
+        """
+        if not results["solucion"].is_finished():
+            return
+        estadisticas = json.dumps({
+            campo: valor for campo, valor in results.items() if campo not in NO_GUARDADOS
+        })
+        movimientos = results["movimientos"]
+        self.conexion.execute(
+            "INSERT OR REPLACE INTO soluciones VALUES (?, ?, ?, ?, ?, ?)",
+            (hash_nivel(root), clave_ajustes(config), movimientos, estadisticas,
+             len(movimientos) + len(estadisticas), time.time()),
+        )
+        self._desalojar()
+        self.conexion.commit()
+
+    def _desalojar(self):
+        """Borra las entradas menos usadas recientemente hasta respetar el
+        tamaño maximo."""
+        total = self.conexion.execute("SELECT COALESCE(SUM(tamano), 0) FROM soluciones").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        filas = self.conexion.execute("SELECT rowid, tamano FROM soluciones ORDER BY usado").fetchall()
+        borrar = []
+        for rowid, tamano in filas:
+            if total <= self.max_bytes:
+                break
+            borrar.append((rowid,))
+            total -= tamano
+        self.conexion.executemany("DELETE FROM soluciones WHERE rowid = ?", borrar)
+
+    def invalidar(self, root=None) -> int:
+        """Borra las entradas de un nivel, o todas.
+
+        Args:
+            root (Sokoban): estado inicial del nivel, None para borrar todo
+
+        Returns:
+            int: cantidad de entradas borradas
+        """
+        if root is None:
+            cursor = self.conexion.execute("DELETE FROM soluciones")
+        else:
+            cursor = self.conexion.execute("DELETE FROM soluciones WHERE nivel = ?", (hash_nivel(root),))
+        self.conexion.commit()
+        return cursor.rowcount
+
+    def info(self) -> dict:
+        """Cantidad de entradas y tamaño total en bytes."""
+        entradas, tamano = self.conexion.execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM soluciones"
+        ).fetchone()
+        return {"ruta": self.ruta, "entradas": entradas, "tamano": tamano}
+
+    def close(self):
+        self.conexion.close()
+
+
+def abrir_cache(config):
+    """Abre la cache indicada en `config.cache` (una ruta, o True para la
+    ubicacion por defecto), con el limite `config.cache_max_mb`. No se usa
+    con `guardar_explorados` ni con `perfilar`, porque los estados explorados
+    y el perfil no se guardan.
+
+    Returns:
+        CacheSoluciones: cache abierta, None si la configuración no usa cache
+    """
+    ruta = getattr(config, "cache", None)
+    if not ruta or any(getattr(config, opcion, False) for opcion in SIN_CACHE):
+        return None
+    return CacheSoluciones(RUTA_DEFECTO if ruta is True else ruta, getattr(config, "cache_max_mb", 64))
+
+
+def main(argv=None):
+    from .sokoban import Sokoban
+    from .solve import cargar_config
+
+    parser = argparse.ArgumentParser(description="Administra la cache de soluciones.")
+    parser.add_argument("comando", choices=["info", "invalidar"])
+    parser.add_argument("niveles", nargs="*", help="archivos de configuración a invalidar (todos si no se indican)")
+    parser.add_argument("--ruta", default=RUTA_DEFECTO)
+    args = parser.parse_args(argv)
+
+    cache = CacheSoluciones(args.ruta)
+    if args.comando == "info":
+        print(json.dumps(cache.info()))
+    elif not args.niveles:
+        print("Entradas borradas: {}".format(cache.invalidar()))
+    else:
+        for archivo in args.niveles:
+            root = Sokoban()
+            root.parse_grid(cargar_config(archivo).mapa)
+            print("{}: {} entradas borradas".format(archivo, cache.invalidar(root)))
+    cache.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""
+Lectura de colecciones de niveles en los formatos de texto habituales
+(.xsb, .sok, .txt): varios tableros por archivo, separados por lineas en
+blanco, titulos o comentarios.
+
+    for titulo, root in cargar_coleccion("niveles/microban.xsb"):
+        ...
+
+Las tablas estaticas de cada nivel (casillas muertas, distancias y claves de
+Zobrist) se guardan en un archivo binario junto a la coleccion, para no
+recalcularlas en cada carga. El archivo solo contiene datos (un indice JSON
+y los bytes de cada tabla), por lo que leer uno ajeno es seguro.
+"""
+import array
+import hashlib
+import json
+import os
+import sys
+
+from .nivel import Nivel
+from .sokoban import Sokoban
+
+
+# caracteres que pueden aparecer en una fila de un tablero
+CARACTERES_TABLERO = set("#@+$*. -_")
+
+# extension del archivo con las tablas estaticas de una coleccion
+EXTENSION_CACHE = ".tablas"
+
+# primera linea del archivo de tablas estaticas
+CABECERA = b"SOKOBAN-TABLAS\n"
+
+
+def _es_fila(linea: str) -> bool:
+    return "#" in linea and set(linea) <= CARACTERES_TABLERO
+
+
+def leer_mapas(lineas):
+    """Separa los tableros de una coleccion a medida que se leen las lineas.
+
+    Un titulo puede venir antes del tablero (como comentario "; titulo" o
+    como una linea de texto suelta) o despues, como "Title: titulo" (formato
+    .sok). Las demas lineas "Clave: valor" (Author, Comment, ...) se ignoran.
+
+    Args:
+        lineas (iterable): lineas del archivo (por ejemplo el archivo abierto)
+
+    Yields:
+        tuple: (titulo, mapa) con el mapa en el formato de `Sokoban.parse_grid`;
+        el titulo es None si el nivel no tiene
+    """
+    filas = []
+    titulo = None
+    candidato = None
+    for linea in lineas:
+        linea = linea.rstrip("\r\n").rstrip()
+        if _es_fila(linea):
+            filas.append(linea)
+            continue
+        if filas:
+            # termino un tablero: queda pendiente por si sigue su "Title:"
+            pendiente, filas = filas, []
+            if titulo is not None:
+                yield titulo[0], titulo[1]
+            titulo = [candidato, "\n" + "\n".join(pendiente) + "\n"]
+            candidato = None
+        texto = linea.lstrip(";").strip()
+        if not texto:
+            continue
+        clave, separador, valor = texto.partition(":")
+        if separador and clave.strip().lower() == "title":
+            if titulo is not None and titulo[0] is None:
+                titulo[0] = valor.strip()
+            else:
+                candidato = valor.strip()
+        elif not separador and candidato is None:
+            candidato = texto
+
+    if filas:
+        if titulo is not None:
+            yield titulo[0], titulo[1]
+        titulo = [candidato, "\n" + "\n".join(filas) + "\n"]
+    if titulo is not None:
+        yield titulo[0], titulo[1]
+
+
+def leer_tablas(ruta: str) -> dict:
+    """Lee un archivo de tablas estaticas. El formato no ejecuta codigo: una
+    linea de cabecera, un indice JSON en la segunda linea y a continuacion
+    los bytes de cada `array.array`. Si el archivo no existe, esta dañado o
+    es de otra version de `Nivel.VERSION_TABLAS`, o de una plataforma con
+    otro orden de bytes, se ignora.
+
+    Args:
+        ruta (str): archivo de tablas
+
+    Returns:
+        dict: clave del mapa -> tablas del nivel (ver `Nivel.tablas_estaticas`)
+    """
+    try:
+        with open(ruta, "rb") as f:
+            cabecera = f.readline()
+            indice = json.loads(f.readline())
+            datos = f.read()
+    except (OSError, ValueError):
+        return {}
+    if (cabecera != CABECERA or indice.get("version") != Nivel.VERSION_TABLAS
+            or indice.get("orden") != sys.byteorder):
+        return {}
+
+    tablas = {}
+    try:
+        for clave, entradas in indice["niveles"].items():
+            nivel = {}
+            for nombre, (tipo, inicio, largo) in entradas.items():
+                tabla = array.array(tipo)
+                tabla.frombytes(datos[inicio:inicio + largo])
+                nivel[nombre] = tabla
+            tablas[clave] = nivel
+    except (KeyError, TypeError, ValueError):
+        return {}
+    return tablas
+
+
+def guardar_tablas(ruta: str, tablas: dict):
+    """Escribe un archivo de tablas estaticas en el formato de `leer_tablas`.
+    Se escribe en un archivo temporal y se reemplaza al final, para no dejar
+    un archivo a medio escribir.
+
+    Args:
+        ruta (str): archivo de tablas
+        tablas (dict): clave del mapa -> tablas del nivel
+    """
+    indice = {}
+    bloques = []
+    inicio = 0
+    for clave, nivel in tablas.items():
+        indice[clave] = {}
+        for nombre, tabla in nivel.items():
+            bloque = tabla.tobytes()
+            indice[clave][nombre] = [tabla.typecode, inicio, len(bloque)]
+            bloques.append(bloque)
+            inicio += len(bloque)
+
+    temporal = ruta + ".tmp"
+    with open(temporal, "wb") as f:
+        f.write(CABECERA)
+        f.write(json.dumps({
+            "version": Nivel.VERSION_TABLAS, "orden": sys.byteorder, "niveles": indice,
+        }).encode() + b"\n")
+        f.writelines(bloques)
+    os.replace(temporal, ruta)
+
+
+def cargar_coleccion(ruta: str, usar_cache: bool = True, guardar: bool = True):
+    """Carga de a un nivel por vez los tableros de un archivo de coleccion.
+
+    Con `usar_cache` las tablas estaticas de cada nivel se leen del archivo
+    `ruta + ".tablas"` si ya estaban calculadas. Con `guardar`, ademas, se
+    calculan las de los niveles nuevos y se agregan al archivo al terminar
+    de recorrer la coleccion (o al dejar de iterarla); sin `guardar` las
+    tablas faltantes se calculan recien al usarlas.
+
+    Args:
+        ruta (str): archivo .xsb, .sok o .txt
+        usar_cache (bool): usar el archivo de tablas estaticas
+        guardar (bool): completar el archivo de tablas estaticas
+
+    Yields:
+        tuple: (titulo, estado inicial)
+    """
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    ruta_cache = ruta + EXTENSION_CACHE
+    tablas = leer_tablas(ruta_cache) if usar_cache else {}
+    guardar = usar_cache and guardar
+    nuevas = False
+
+    try:
+        with open(ruta, encoding="utf-8", errors="replace") as f:
+            for n, (titulo, mapa) in enumerate(leer_mapas(f), 1):
+                root = Sokoban()
+                if not usar_cache:
+                    root.parse_grid(mapa)
+                    yield titulo or "{} #{}".format(nombre, n), root
+                    continue
+                clave = hashlib.sha1(mapa.encode()).hexdigest()
+                root.parse_grid(mapa, tablas.get(clave))
+                if guardar and clave not in tablas:
+                    tablas[clave] = root.nivel.tablas_estaticas()
+                    nuevas = True
+                yield titulo or "{} #{}".format(nombre, n), root
+    finally:
+        if nuevas:
+            guardar_tablas(ruta_cache, tablas)
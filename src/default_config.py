@@ -1,7 +1,27 @@
 
-algoritmo = "dfs"
+algoritmo = "dfs"  # bfs, dfs, greedy, a_star, weighted_a_star, anytime_a_star, beam, ida_star, bidireccional, portfolio
 verbose = True
-heuristicas = ["manhattan"]
+heuristicas = ["manhattan"]  # manhattan, distancia_a_caja, matching, matching_greedy
+expansion = "pasos"  # "pasos" o "empujes"
+tabla_transposicion = 100000  # estados guardados por ida_star
+beam_width = 100  # estados conservados por nivel en beam
+weight = 2.0  # peso de la heuristica en weighted_a_star y anytime_a_star (f = g + w * h)
+weight_step = 0.5  # cuanto baja el peso entre corridas de anytime_a_star
+backend = "tuplas"  # "tuplas" o "bitboard"
+portfolio = [  # estrategias que compiten con algoritmo = "portfolio"
+    {"algoritmo": "dfs"},
+    {"algoritmo": "a_star", "heuristicas": ["matching"], "expansion": "empujes"},
+    {"algoritmo": "bidireccional"},
+]
+portfolio_deadline = None  # segundos para elegir la mejor solucion, None: gana la primera
+observador_cada = 1000  # nodos entre eventos de progreso
+max_nodes = None  # limite de nodos explorados
+max_seconds = None  # limite de tiempo de la busqueda
+max_memory_mb = None  # limite de memoria residente
+cache = None  # ruta de la cache de soluciones, True para la ubicacion por defecto
+cache_max_mb = 64  # tamaño maximo de la cache
+instrumentar = False  # tiempos por fase en results["estadisticas"]
+perfilar = False  # correr la busqueda bajo cProfile (results["perfil"])
 mapa = """
 #######
 #@$  .#
@@ -0,0 +1,196 @@
+import heapq
+import itertools
+from abc import ABC, abstractmethod
+from collections import deque
+
+from .sokoban import resolver_heuristica
+
+
+class Frontera(ABC):
+    """
+    Interfaz de la frontera de busqueda. Cada algoritmo define en que orden
+    se visitan los nodos eligiendo el contenedor adecuado. Una frontera que no
+    implementa push, pop y __len__ no se puede instanciar.
+    """
+
+    # indica si la busqueda debe reinsertar estados alcanzados con menor costo
+    usa_costo = False
+
+    @abstractmethod
+    def push(self, state):
+        """Inserta un estado en la frontera.
+
+        Args:
+            state (Sokoban): estado a insertar
+        """
+
+    @abstractmethod
+    def pop(self):
+        """Extrae el proximo estado a visitar.
+
+        Returns:
+            Sokoban: estado a visitar
+        """
+
+    @abstractmethod
+    def __len__(self):
+        """Cantidad de estados en la frontera."""
+
+
+class FronteraFIFO(Frontera):
+    """Cola FIFO sobre un deque: push y pop en O(1). Usada por BFS."""
+
+    def __init__(self):
+        self.nodos = deque()
+
+    def push(self, state):
+        self.nodos.append(state)
+
+    def pop(self):
+        return self.nodos.popleft()
+
+    def __len__(self):
+        return len(self.nodos)
+
+
+class FronteraLIFO(Frontera):
+    """Pila LIFO sobre una lista: push y pop en O(1). Usada por DFS."""
+
+    def __init__(self):
+        self.nodos = []
+
+    def push(self, state):
+        self.nodos.append(state)
+
+    def pop(self):
+        return self.nodos.pop()
+
+    def __len__(self):
+        return len(self.nodos)
+
+
+class FronteraPrioridad(Frontera):
+    """Cola de prioridad sobre un heap. La clave de cada estado se calcula una
+    unica vez al insertarlo y a igual clave se respeta el orden de insercion.
+    """
+
+    def __init__(self, clave, usa_costo=False):
+        """
+        Args:
+            clave (callable): funcion que devuelve la prioridad de un estado
+            usa_costo (bool): reinsertar estados alcanzados con menor costo
+        """
+        self.clave = clave
+        self.usa_costo = usa_costo
+        self.nodos = []
+        self.contador = itertools.count()
+
+    def push(self, state):
+        heapq.heappush(self.nodos, (self.clave(state), next(self.contador), state))
+
+    def pop(self):
+        return heapq.heappop(self.nodos)[-1]
+
+    def __len__(self):
+        return len(self.nodos)
+
+
+class FronteraHaz(Frontera):
+    """Frontera de la busqueda en haz (beam search): los estados se visitan
+    por niveles como en BFS, pero al pasar al nivel siguiente solo se
+    conservan los `ancho` de menor clave. Acota la memoria y el tiempo por
+    nivel, a cambio de no ser completa: si el haz descarta todos los caminos
+    a la solucion, la frontera se vacia sin encontrarla.
+    """
+
+    def __init__(self, clave, ancho: int):
+        """
+        Args:
+            clave (callable): funcion que devuelve la prioridad de un estado
+            ancho (int): estados conservados por nivel
+        """
+        self.clave = clave
+        self.ancho = max(ancho, 1)
+        # nivel actual, con el mejor estado al final
+        self.nivel = []
+        self.siguiente = []
+
+    def push(self, state):
+        self.siguiente.append(state)
+
+    def pop(self):
+        if not self.nivel:
+            self.nivel = heapq.nsmallest(self.ancho, self.siguiente, key=self.clave)[::-1]
+            self.siguiente = []
+        return self.nivel.pop()
+
+    def __len__(self):
+        return len(self.nivel) + len(self.siguiente)
+
+
+def _frontera_greedy(config):
+    heuristica = resolver_heuristica(config.heuristicas)
+    return FronteraPrioridad(lambda s: (heuristica(s),))
+
+
+def _frontera_a_star(config):
+    heuristica = resolver_heuristica(config.heuristicas)
+
+    def clave(s):
+        h = heuristica(s)
+        return (s.g + h, h)
+    return FronteraPrioridad(clave, usa_costo=True)
+
+
+def frontera_ponderada(heuristicas, peso: float):
+    """Frontera de A* ponderado, con clave f = g + w * h. Con w > 1 se llega
+    antes a una solucion, a lo sumo w veces mas larga que la optima si la
+    heuristica es admisible.
+
+    Args:
+        heuristicas (list): nombres de las heuristicas
+        peso (float): peso w de la heuristica
+
+    Returns:
+        FronteraPrioridad: frontera vacia
+    """
+    heuristica = resolver_heuristica(heuristicas)
+
+    def clave(s):
+        h = heuristica(s)
+        return (s.g + peso * h, h)
+    return FronteraPrioridad(clave, usa_costo=True)
+
+
+def _frontera_beam(config):
+    heuristica = resolver_heuristica(config.heuristicas)
+    return FronteraHaz(lambda s: (heuristica(s), s.g), getattr(config, "beam_width", 100))
+
+
+# Fabricas de frontera por algoritmo. Para sumar una estrategia nueva alcanza
+# con registrar aqui su fabrica.
+FRONTERAS = {
+    "bfs": lambda config: FronteraFIFO(),
+    "dfs": lambda config: FronteraLIFO(),
+    "greedy": _frontera_greedy,
+    "a_star": _frontera_a_star,
+    "weighted_a_star": lambda config: frontera_ponderada(config.heuristicas, getattr(config, "weight", 2.0)),
+    "beam": _frontera_beam,
+}
+
+
+def crear_frontera(config):
+    """Crea la frontera correspondiente al algoritmo de la configuración.
+
+    Args:
+        config (module): configuración de la busqueda
+
+    Raises:
+        ValueError: si el algoritmo no esta registrado
+
+    Returns:
+        Frontera: frontera vacia
+    """
+    if config.algoritmo not in FRONTERAS:
+        raise ValueError("Algoritmo Invalido")
+    return FRONTERAS[config.algoritmo](config)
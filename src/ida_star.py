@@ -0,0 +1,159 @@
+import time
+from collections import OrderedDict
+
+from .instrumentacion import Presupuesto
+from .sokoban import crear_verificador, resolver_heuristica
+
+
+class TablaTransposicion:
+    """
+    Tabla de tamaño acotado con el menor costo con el que se visito cada
+    estado en la iteracion actual. Al llenarse descarta el estado usado hace
+    mas tiempo (LRU), por lo que la memoria se mantiene constante.
+    """
+
+    def __init__(self, capacidad: int):
+        """
+        Args:
+            capacidad (int): cantidad maxima de estados guardados
+        """
+        self.capacidad = capacidad
+        self.costos = OrderedDict()
+
+    def ya_visitado(self, key, g: int) -> bool:
+        """Indica si el estado ya se exploro con un costo menor o igual y si
+        no, lo registra con el costo actual.
+
+        Args:
+            key (int): clave del estado
+            g (int): costo con el que se llega al estado
+
+        Returns:
+            bool: True si se puede podar el estado
+        """
+        costos = self.costos
+        previo = costos.get(key)
+        if previo is not None:
+            costos.move_to_end(key)
+            if previo <= g:
+                return True
+        costos[key] = g
+        if len(costos) > self.capacidad:
+            costos.popitem(last=False)
+        return False
+
+    def clear(self):
+        self.costos.clear()
+
+
+def ida_star(root, config):
+    """Busqueda A* de profundizacion iterativa (IDA*). Recorre en profundidad
+    podando los nodos con f = g + h mayor al umbral, y en cada iteracion sube
+    el umbral al menor f podado. Solo guarda el camino actual y una tabla de
+    transposicion acotada (`config.tabla_transposicion`), por lo que usa
+    memoria casi constante y, con una heuristica admisible, devuelve una
+    solucion optima (tambien con `expansion = "empujes"`).
+
+    Args:
+        root (Sokoban): estado inicial del juego.
+        config (module): configuración de la busqueda.
+
+    Returns:
+        dict: resultados de la busqueda, con la cantidad de iteraciones y los
+        umbrales usados en cada una.
+    """
+    t_inicial = time.time()
+    heuristica = resolver_heuristica(getattr(config, "heuristicas", []))
+    por_empujes = getattr(config, "expansion", "pasos") == "empujes"
+    tabla = TablaTransposicion(getattr(config, "tabla_transposicion", 100000))
+    verificar = crear_verificador(config, por_empujes)
+    presupuesto = Presupuesto(config)
+    excedido = None
+
+    root = root.as_root()
+    umbral = heuristica(root)
+    umbrales = []
+    nodos_explorados = 0
+    nodos_generados = 0
+    max_nivel_alcanzado = 0
+    solucion = None
+    mejor_h = umbral
+    mejor_estado = root
+
+    while solucion is None and not excedido:
+        umbrales.append(umbral)
+        if config.verbose: print("Iteracion {}\tUmbral {}".format(len(umbrales), umbral))
+        tabla.clear()
+        siguiente_umbral = float("inf")
+
+        # pila de iteradores de hijos pendientes y estados del camino actual
+        pila = [iter([root])]
+        camino = []
+        en_camino = set()
+        while pila:
+            state = next(pila[-1], None)
+            if state is None:
+                pila.pop()
+                if camino:
+                    en_camino.discard(camino.pop().get_key(por_empujes))
+                continue
+
+            f = state.g + heuristica(state)
+            if f > umbral:
+                siguiente_umbral = min(siguiente_umbral, f)
+                continue
+
+            key = state.get_key(por_empujes)
+            if verificar: verificar(state)
+            # la tabla usa la casilla exacta del jugador: con la region
+            # normalizada podaria por g estados con distinto costo de
+            # caminata restante y se perderia la optimalidad
+            if key in en_camino or tabla.ya_visitado(state.get_key(), state.g):
+                continue
+
+            if state.is_finished():
+                solucion = state
+                break
+
+            excedido = presupuesto.excedido(nodos_explorados)
+            if excedido:
+                break
+            if heuristica(state) < mejor_h:
+                mejor_h = heuristica(state)
+                mejor_estado = state
+
+            nodos_explorados += 1
+            max_nivel_alcanzado = max(max_nivel_alcanzado, state.g)
+
+            sucesores = state.get_successors(por_empujes)
+            nodos_generados += len(sucesores)
+            hijos = [child for child in sucesores if not child.is_deadlocked(incremental=True)]
+            hijos.sort(key=heuristica)
+            camino.append(state)
+            en_camino.add(key)
+            pila.append(iter(hijos))
+
+        if excedido:
+            if config.verbose: print("Presupuesto excedido: {}".format(excedido))
+            solucion = mejor_estado
+            break
+        if solucion is None and siguiente_umbral == float("inf"):
+            # se recorrio todo el espacio sin encontrar solucion
+            solucion = root
+            break
+        umbral = siguiente_umbral
+
+    if config.verbose and solucion.is_finished(): print("Solucion Encontrada")
+
+    return {
+        "tiempo": time.time() - t_inicial,
+        "nodos_explorados": nodos_explorados,
+        "nodos_generados": nodos_generados,
+        "profundidad_maxima": max_nivel_alcanzado,
+        "solucion": solucion,
+        "movimientos": solucion.movements,
+        "iteraciones": len(umbrales),
+        "umbrales": umbrales,
+        "presupuesto_excedido": excedido,
+        "mejor_h": mejor_h,
+    }
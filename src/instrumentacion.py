@@ -0,0 +1,203 @@
+import cProfile
+import os
+import pstats
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+class Estadisticas:
+    """
+    Contadores y cronometros por fase de una busqueda. Los contadores se
+    llevan siempre; los cronometros solo con `cronometrar`, para que sin
+    instrumentacion el costo sea una comparacion por fase.
+
+    Fases: expansion (generar sucesores), deadlock, duplicados (claves y
+    tablas de visitados), heuristica y frontera (push y pop sin contar la
+    heuristica).
+    """
+
+    FASES = ("expansion", "deadlock", "duplicados", "heuristica", "frontera")
+
+    def __init__(self, cronometrar: bool = False, observador=None, cada: int = 1000):
+        """
+        Args:
+            cronometrar (bool): medir el tiempo acumulado de cada fase
+            observador (callable): funcion llamada con `as_dict()` cada
+            `cada` nodos explorados
+            cada (int): frecuencia del observador
+        """
+        self.cronometrar = cronometrar
+        self.observador = observador
+        self.cada = cada
+        self.t_inicial = time.perf_counter()
+        self.tiempos = dict.fromkeys(self.FASES, 0.0)
+        self.explorados = 0
+        self.generados = 0
+        self.podados_deadlock = 0
+        self.podados_duplicados = 0
+        self.frontera_maxima = 0
+        self.frontera_actual = 0
+
+    @classmethod
+    def desde_config(cls, config):
+        """Estadisticas con los campos `instrumentar`, `observador` y
+        `observador_cada` de la configuración."""
+        return cls(
+            getattr(config, "instrumentar", False),
+            getattr(config, "observador", None),
+            getattr(config, "observador_cada", 1000),
+        )
+
+    def cronometro(self, fase: str, funcion):
+        """Envuelve una funcion para acumular su tiempo en una fase. Sin
+        cronometros devuelve la funcion original.
+
+        Args:
+            fase (str): fase en la que se acumula el tiempo
+            funcion (callable): funcion a medir
+
+        Returns:
+            callable: funcion equivalente
+        """
+        if not self.cronometrar:
+            return funcion
+        tiempos = self.tiempos
+        reloj = time.perf_counter
+
+        def medida(*args):
+            t = reloj()
+            try:
+                return funcion(*args)
+            finally:
+                tiempos[fase] += reloj() - t
+        return medida
+
+    def nodo_explorado(self, frontera: int) -> bool:
+        """Registra un nodo explorado y el tamaño actual de la frontera, y
+        avisa al observador cuando corresponde.
+
+        Args:
+            frontera (int): cantidad de nodos en la frontera
+
+        Returns:
+            bool: True cada `cada` nodos, cuando corresponde informar el
+            progreso
+        """
+        self.explorados += 1
+        self.frontera_actual = frontera
+        if frontera > self.frontera_maxima:
+            self.frontera_maxima = frontera
+        if self.explorados % self.cada:
+            return False
+        if self.observador is not None:
+            self.observador(self.as_dict())
+        return True
+
+    def as_dict(self) -> dict:
+        estadisticas = {
+            "tiempo": time.perf_counter() - self.t_inicial,
+            "nodos_explorados": self.explorados,
+            "nodos_generados": self.generados,
+            "podados_deadlock": self.podados_deadlock,
+            "podados_duplicados": self.podados_duplicados,
+            "frontera_actual": self.frontera_actual,
+            "frontera_maxima": self.frontera_maxima,
+        }
+        if self.cronometrar:
+            tiempos = dict(self.tiempos)
+            # el push de la frontera incluye el calculo de la heuristica
+            tiempos["frontera"] = max(tiempos["frontera"] - tiempos["heuristica"], 0.0)
+            estadisticas["tiempos"] = tiempos
+        return estadisticas
+
+
+def perfilar(funcion, *args):
+    """Corre una funcion bajo cProfile.
+
+    Args:
+        funcion (callable): funcion a perfilar
+        *args: argumentos de la funcion
+
+    Returns:
+        tuple: (resultado de la funcion, pstats.Stats ordenado por tiempo
+        acumulado)
+    """
+    perfil = cProfile.Profile()
+    resultado = perfil.runcall(funcion, *args)
+    return resultado, pstats.Stats(perfil).sort_stats("cumulative")
+
+
+def memoria_mb():
+    """Memoria residente del proceso en MB. En Linux es la actual; en otros
+    sistemas con `resource`, el pico alcanzado.
+
+    Returns:
+        float: memoria en MB, None si no se puede medir
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        pass
+    return memoria_pico_mb()
+
+
+def memoria_pico_mb():
+    """Pico de memoria residente del proceso en MB.
+
+    Returns:
+        float: memoria en MB, None si no se puede medir (Windows)
+    """
+    if resource is None:
+        return None
+    # ru_maxrss esta en KB en Linux y en bytes en macOS
+    escala = 2 ** 20 if sys.platform == "darwin" else 2 ** 10
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / escala
+
+
+class Presupuesto:
+    """
+    Limites de una busqueda leidos de la configuración: `max_nodes` (nodos
+    explorados), `max_seconds` y `max_memory_mb`. El limite de nodos se
+    revisa en cada nodo; el tiempo y la memoria cada `CADA` nodos, para que
+    el control sea barato.
+    """
+
+    CADA = 128
+
+    def __init__(self, config):
+        """
+        Args:
+            config (module): configuración de la busqueda
+        """
+        self.max_nodos = getattr(config, "max_nodes", None)
+        self.max_segundos = getattr(config, "max_seconds", None)
+        self.max_memoria = getattr(config, "max_memory_mb", None)
+        self.periodico = self.max_segundos is not None or self.max_memoria is not None
+        self.t_inicial = time.perf_counter()
+
+    def excedido(self, nodos: int):
+        """Revisa los limites despues de explorar un nodo.
+
+        Args:
+            nodos (int): nodos explorados hasta ahora
+
+        Returns:
+            str: nombre del limite excedido, None si no se excedio ninguno
+        """
+        if self.max_nodos is not None and nodos >= self.max_nodos:
+            return "max_nodes"
+        if not self.periodico or nodos % self.CADA:
+            return None
+        if self.max_segundos is not None and time.perf_counter() - self.t_inicial >= self.max_segundos:
+            return "max_seconds"
+        if self.max_memoria is not None:
+            memoria = memoria_mb()
+            if memoria is not None and memoria >= self.max_memoria:
+                return "max_memory_mb"
+        return None
@@ -1,12 +1,23 @@
 import pygame
 import os
 import sys
-import time
 import tkinter as tk
+from collections import deque
 from tkinter import filedialog, messagebox
 import matplotlib.pyplot as plt
-from sokoban import Sokoban
-from tree import recorre_arbol
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.sokoban import Sokoban
+from src.trabajador import Trabajador
+
+# milisegundos entre movimientos al reproducir una solucion
+PASO_REPRODUCCION = 200
+# milisegundos entre consultas al progreso de las busquedas
+INTERVALO_PROGRESO = 100
+# nodos explorados entre eventos de progreso de cada busqueda
+PROGRESO_CADA = 500
+# milisegundos entre cuadros del ciclo de dibujo
+INTERVALO_DIBUJO = 50
 
 class SokobanUI:
     def __init__(self, root):
@@ -38,6 +49,13 @@ class SokobanUI:
 
         self.embed_pygame = tk.Frame(root, width=640, height=480)
         self.embed_pygame.pack()
+
+        self.barra = tk.Frame(root)
+        self.barra.pack(fill=tk.X)
+        self.boton_cancelar = tk.Button(self.barra, text="Cancelar", command=self.cancelar, state=tk.DISABLED)
+        self.boton_cancelar.pack(side=tk.LEFT)
+        self.etiqueta_progreso = tk.Label(self.barra, text="", anchor="w")
+        self.etiqueta_progreso.pack(side=tk.LEFT, fill=tk.X)
         self.root.bind("<KeyPress>", self.procesar_tecla)
         
         self.config = self.cargar_configuracion()
@@ -52,6 +70,18 @@ class SokobanUI:
         self.solucion = ""
 
         self.resultados = ""
+        self.trabajadores = {}
+        self.progreso = {}
+        self.consulta = None
+        self.inicio = self.juego
+        self.reproducciones = deque()
+        self.reproduccion = None
+
+        # estado del ultimo cuadro dibujado
+        self.fondo = None
+        self.juego_dibujado = None
+        self.contenido_dibujado = {}
+        self.mensaje = None
         
         self.actualizar_pantalla()
     
@@ -70,29 +100,73 @@ class SokobanUI:
                 "caja": (160, 82, 45), "objetivo": (200, 180, 0), "texto": (255, 255, 255),
                 "victoria": (0, 255, 0), "derrota": (255, 255, 0)}
     
+    def dibujar_fondo(self):
+        """Dibuja una unica vez por nivel las partes fijas del tablero
+        (paredes y goals) en una superficie que se reutiliza en cada cuadro."""
+        nivel = self.juego.nivel
+        self.fondo = pygame.Surface(self.pantalla.get_size())
+        self.fondo.fill(self.colores["fondo"])
+        for p in range(nivel.rows * nivel.cols):
+            if nivel.paredes[p]:
+                pygame.draw.rect(self.fondo, self.colores["pared"], self.rect_celda(p))
+            elif p in nivel.goals:
+                pygame.draw.rect(self.fondo, self.colores["objetivo"], self.rect_celda(p))
+
+    def rect_celda(self, p):
+        y, x = self.juego.nivel.posicion(p)
+        return pygame.Rect(x*40, y*40, 40, 40)
+
+    def dibujar_celda(self, p, contenido):
+        """Restaura el fondo de una celda y dibuja encima su contenido."""
+        rect = self.rect_celda(p)
+        self.pantalla.blit(self.fondo, rect, rect)
+        if p in contenido:
+            pygame.draw.rect(self.pantalla, self.colores[contenido[p]], rect)
+        return rect
+
+    def dibujar_mensaje(self, mensaje):
+        """Dibuja el mensaje de fin de juego sobre el tablero."""
+        texto, color = mensaje
+        return self.pantalla.blit(self.fuente.render(texto, True, color), (160, 240))
+
     def actualizar_pantalla(self):
-        self.pantalla.fill(self.colores["fondo"])
-        for y, fila in enumerate(self.juego.grid):
-            for x, celda in enumerate(fila):
-                rect = pygame.Rect(x*40, y*40, 40, 40)
-                if celda == self.juego.WALL:
-                    pygame.draw.rect(self.pantalla, self.colores["pared"], rect)
-                elif (y, x) == self.juego.player:
-                    pygame.draw.rect(self.pantalla, self.colores["jugador"], rect)
-                elif (y, x) in self.juego.boxes:
-                    pygame.draw.rect(self.pantalla, self.colores["caja"], rect)
-                elif (y, x) in self.juego.goals:
-                    pygame.draw.rect(self.pantalla, self.colores["objetivo"], rect)
-        
-        if self.juego.is_finished():
-            self.pantalla.blit(self.fuente.render("¡Nivel completado!", True, self.colores["victoria"]), (160, 240))
-        
-        if self.juego.is_deadlocked():
-            self.pantalla.blit(self.fuente.render("¡Juego Bloqueado!", True, self.colores["derrota"]), (160, 240))
+        """Unico ciclo de dibujo, a ritmo fijo. Solo se redibujan las celdas
+        cuyo contenido cambio desde el cuadro anterior; el tablero completo se
+        redibuja al cambiar de nivel o de mensaje."""
+        juego = self.juego
+        if juego is not self.juego_dibujado:
+            if juego.is_finished():
+                mensaje = ("¡Nivel completado!", self.colores["victoria"])
+            elif juego.is_deadlocked():
+                mensaje = ("¡Juego Bloqueado!", self.colores["derrota"])
+            else:
+                mensaje = None
 
-        pygame.display.flip()
-        self.root.after(200, self.actualizar_pantalla)
+            # que hay sobre el fondo en cada celda ocupada
+            contenido = dict.fromkeys(juego._box_indices(), "caja")
+            contenido[juego._player] = "jugador"
+            if self.fondo is None or mensaje != self.mensaje:
+                if self.fondo is None: self.dibujar_fondo()
+                self.pantalla.blit(self.fondo, (0, 0))
+                for p in contenido:
+                    self.dibujar_celda(p, contenido)
+                if mensaje:
+                    self.dibujar_mensaje(mensaje)
+                pygame.display.flip()
+            else:
+                anterior = self.contenido_dibujado
+                sucias = [p for p in contenido.keys() | anterior.keys() if contenido.get(p) != anterior.get(p)]
+                rects = [self.dibujar_celda(p, contenido) for p in sucias]
+                # las celdas se restauran desde el fondo, que no tiene el
+                # mensaje: se vuelve a dibujar encima
+                if mensaje and rects:
+                    rects.append(self.dibujar_mensaje(mensaje))
+                pygame.display.update(rects)
+            self.mensaje = mensaje
+            self.juego_dibujado = juego
+            self.contenido_dibujado = contenido
 
+        self.root.after(INTERVALO_DIBUJO, self.actualizar_pantalla)
 
     def procesar_tecla(self, event):
         """Procesa el evento de teclado y mueve el jugador."""
@@ -105,41 +179,105 @@ class SokobanUI:
         if event.keysym in direcciones:
             juego = direcciones[event.keysym]()
             self.juego = juego if juego else self.juego
-            self.actualizar_pantalla()
             
     
     def ejecutar_algoritmo(self, algoritmo):
-        "Ejecuta el algoritmo seleccionado y luego dispara las teclas para la solución."
-        self.config.algoritmo = algoritmo
-        self.solucion = recorre_arbol(self.juego, self.config)
-
-        evento = {
-            "r": "<KeyPress-Right>",
-            "l": "<KeyPress-Left>",
-            "d": "<KeyPress-Down>",
-            "u": "<KeyPress-Up>",
-        }
-        for direccion in self.solucion["movimientos"]:   
-            self.root.event_generate(evento[direccion])
-            time.sleep(0.2)
+        "Ejecuta el algoritmo seleccionado en otro proceso y al terminar reproduce la solución."
+        self.lanzar_busquedas([algoritmo])
 
-        # Guarda resultados
-        solucion = self.solucion
+    def ejecutar_todos_algoritmos(self):
+        "Ejecuta todos los algoritmos a la vez y reproduce las soluciones a medida que terminan."
+        self.lanzar_busquedas(["bfs", "dfs", "greedy", "a_star"])
+
+    def lanzar_busquedas(self, algoritmos):
+        """Lanza una busqueda por algoritmo desde el estado actual, cada una en
+        su proceso, y empieza a consultar su progreso."""
+        self.cancelar()
+        self.inicio = self.juego
+        for algoritmo in algoritmos:
+            trabajador = Trabajador(self.juego, self.config, {"algoritmo": algoritmo, "observador_cada": PROGRESO_CADA})
+            trabajador.start()
+            self.trabajadores[algoritmo] = trabajador
+            self.progreso[algoritmo] = "{}: iniciando".format(algoritmo)
+        self.boton_cancelar.config(state=tk.NORMAL)
+        self.consulta = self.root.after(INTERVALO_PROGRESO, self.consultar_busquedas)
+
+    def consultar_busquedas(self):
+        """Lee sin bloquear los eventos de las busquedas en curso, muestra su
+        progreso y encola la reproduccion de las que terminan."""
+        for algoritmo, trabajador in list(self.trabajadores.items()):
+            for evento in trabajador.eventos():
+                if evento["tipo"] == "progreso":
+                    self.progreso[algoritmo] = "{}: {} nodos, {:.0f} nodos/s, frontera {}".format(
+                        algoritmo, evento["nodos_explorados"],
+                        evento["nodos_explorados"] / max(evento["tiempo"], 1e-9), evento["frontera_actual"],
+                    )
+            if trabajador.resultados is not None:
+                del self.trabajadores[algoritmo]
+                self.progreso[algoritmo] = "{}: terminado".format(algoritmo)
+                self.registrar_resultados(algoritmo, trabajador.resultados)
+                self.reproducciones.append(trabajador.resultados["movimientos"])
+                if self.reproduccion is None:
+                    self.reproducir_siguiente()
+            elif not trabajador.activo:
+                del self.trabajadores[algoritmo]
+                self.progreso[algoritmo] = "{}: error".format(algoritmo)
+
+        self.etiqueta_progreso.config(text="    ".join(self.progreso.values()))
+        if self.trabajadores:
+            self.consulta = self.root.after(INTERVALO_PROGRESO, self.consultar_busquedas)
+        else:
+            self.consulta = None
+            self.boton_cancelar.config(state=tk.DISABLED)
+
+    def reproducir_siguiente(self):
+        "Reproduce la próxima solución pendiente desde el estado en que se lanzó la búsqueda."
+        if not self.reproducciones:
+            self.reproduccion = None
+            return
+        # cada reproduccion se identifica para descartar los pasos de una cancelada
+        self.reproduccion = object()
+        self.juego = self.inicio
+        self.reproducir_paso(self.reproducciones.popleft(), self.reproduccion)
+
+    def reproducir_paso(self, movimientos, reproduccion):
+        "Aplica un movimiento de la solución y agenda el siguiente con un timer."
+        if reproduccion is not self.reproduccion:
+            return
+        if not movimientos:
+            self.root.after(PASO_REPRODUCCION * 5, self.reproducir_siguiente)
+            return
+        self.juego = self.juego.apply_moves(movimientos[0]) or self.juego
+        self.root.after(PASO_REPRODUCCION, self.reproducir_paso, movimientos[1:], reproduccion)
+
+    def cancelar(self):
+        "Cancela las búsquedas en curso y las reproducciones pendientes."
+        for algoritmo, trabajador in self.trabajadores.items():
+            trabajador.cancelar()
+            self.progreso[algoritmo] = "{}: cancelado".format(algoritmo)
+        self.trabajadores.clear()
+        if self.consulta is not None:
+            self.root.after_cancel(self.consulta)
+            self.consulta = None
+        self.reproducciones.clear()
+        self.reproduccion = None
+        self.boton_cancelar.config(state=tk.DISABLED)
+        self.etiqueta_progreso.config(text="    ".join(self.progreso.values()))
+        self.progreso = {}
+
+    def registrar_resultados(self, algoritmo, solucion):
+        "Guarda los resultados de una búsqueda para mostrarlos luego."
+        self.solucion = solucion
         mensaje = ""
-        mensaje += "{}\n".format(self.config.algoritmo)
+        mensaje += "{}\n".format(algoritmo)
         mensaje += "-"*40 + "\n"
-        mensaje += "Nodos recorridos:\t\t\t{}\n".format(len(solucion["nodos_explorados"]))
-        mensaje += "Profundidad máxima alcanzada:\t{}\n".format(max(len(x.movements) for x in solucion["nodos_explorados"]))
+        mensaje += "Nodos recorridos:\t\t\t{}\n".format(solucion["nodos_explorados"])
+        mensaje += "Profundidad máxima alcanzada:\t{}\n".format(solucion["profundidad_maxima"])
         mensaje += "Nro. de movimientos:\t\t{}\n".format(len(solucion["movimientos"]))
         mensaje += "Movimientos:\t{}\n\n".format(solucion["movimientos"])
         
         self.resultados += mensaje
         
-    def ejecutar_todos_algoritmos(self):
-        for algoritmo in ["bfs", "dfs", "greedy", "a_star"]:
-            self.ejecutar_algoritmo(algoritmo)
-            self.reiniciar_juego()
-        
     def mostrar_resultados(self):
         messagebox.showinfo("Resultado", self.resultados)
 
@@ -151,9 +289,12 @@ class SokobanUI:
             self.reiniciar_juego()
     
     def reiniciar_juego(self):
+        self.cancelar()
         self.juego = Sokoban()
         self.juego.parse_grid(self.config.mapa)
         self.solucion = ""
+        # el nivel pudo cambiar: se redibuja el fondo en el proximo cuadro
+        self.fondo = None
 
         
     
@@ -0,0 +1,118 @@
+"""
+Asignacion de cajas a goals de costo minimo, usada por la heuristica
+`matching`. Las filas de la matriz de costos son cajas y las columnas goals
+(hay al menos tantos goals como cajas).
+"""
+
+# costo de llevar una caja a un goal inalcanzable
+INFINITO = 10 ** 6
+
+
+def hungaro(costos, u=None, v=None, p=None, filas=None):
+    """Algoritmo hungaro con potenciales, O(n^2 m).
+
+    Admite arrancar de una solucion previa: si solo cambio una fila, alcanza
+    con desasignarla y pasar su indice en `filas` para recalcular la
+    asignacion optima con una sola fase, O(n m). Solo vale para matrices
+    cuadradas: con m > n la columna que queda libre conserva un potencial
+    negativo y la fase puede devolver una asignacion mas cara.
+
+    Args:
+        costos (list): matriz de costos de n filas y m >= n columnas
+        u (list): potenciales de las filas (1-indexado), None para empezar de cero
+        v (list): potenciales de las columnas (1-indexado)
+        p (list): fila asignada a cada columna (1-indexado, 0 si esta libre)
+        filas (iterable): filas (1-indexado) a asignar
+
+    Raises:
+        ValueError: si hay mas filas que columnas
+
+    Returns:
+        tuple: (u, v, p) de la asignacion optima
+    """
+    n = len(costos)
+    m = len(costos[0]) if n else 0
+    if n > m:
+        # alguna fila quedaria sin columna y la fase no terminaria nunca
+        raise ValueError("Hay mas filas que columnas")
+    if u is None:
+        u, v, p = [0] * (n + 1), [0] * (m + 1), [0] * (m + 1)
+        filas = range(1, n + 1)
+
+    for i in filas:
+        p[0] = i
+        j0 = 0
+        minv = [float("inf")] * (m + 1)
+        usada = [False] * (m + 1)
+        camino = [0] * (m + 1)
+        while True:
+            usada[j0] = True
+            i0 = p[j0]
+            fila = costos[i0 - 1]
+            delta = float("inf")
+            j1 = 0
+            for j in range(1, m + 1):
+                if usada[j]:
+                    continue
+                actual = fila[j - 1] - u[i0] - v[j]
+                if actual < minv[j]:
+                    minv[j] = actual
+                    camino[j] = j0
+                if minv[j] < delta:
+                    delta = minv[j]
+                    j1 = j
+            for j in range(m + 1):
+                if usada[j]:
+                    u[p[j]] += delta
+                    v[j] -= delta
+                else:
+                    minv[j] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        # aumenta la asignacion por el camino encontrado
+        while j0:
+            j1 = camino[j0]
+            p[j0] = p[j1]
+            j0 = j1
+
+    return u, v, p
+
+
+def costo_asignacion(costos, p):
+    """Costo total de una asignacion devuelta por `hungaro`.
+
+    Args:
+        costos (list): matriz de costos
+        p (list): fila asignada a cada columna (1-indexado)
+
+    Returns:
+        int: suma de los costos asignados
+    """
+    return sum(costos[i - 1][j - 1] for j, i in enumerate(p) if j and i)
+
+
+def asignacion_greedy(costos):
+    """Aproximacion greedy: asigna primero los pares caja-goal mas baratos.
+    Es mas rapida que el hungaro, pero puede sobreestimar el costo optimo.
+
+    Args:
+        costos (list): matriz de costos de n filas y m >= n columnas
+
+    Returns:
+        int: costo total de la asignacion
+    """
+    pares = sorted(
+        (costo, i, j) for i, fila in enumerate(costos) for j, costo in enumerate(fila)
+    )
+    filas, columnas = set(), set()
+    total = 0
+    for costo, i, j in pares:
+        if i in filas or j in columnas:
+            continue
+        filas.add(i)
+        columnas.add(j)
+        total += costo
+        if len(filas) == len(costos):
+            break
+    return total
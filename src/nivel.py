@@ -0,0 +1,235 @@
+import array
+import functools
+import random
+
+from .matching import INFINITO
+
+
+class Nivel:
+    """
+    Parte estatica de un tablero de Sokoban: paredes, goals y dimensiones.
+    Es de solo lectura y se comparte entre todos los estados de una busqueda,
+    por lo que las tablas que dependen solo del tablero se calculan una vez,
+    la primera vez que se usan. Con `tablas_estaticas` se pueden guardar ya
+    calculadas y pasarlas luego al crear el nivel.
+
+    Las celdas se identifican por un indice lineal ``i * cols + j``.
+    """
+
+    # version del formato de `tablas_estaticas`: cambiarla al modificar el
+    # contenido o la disposicion de alguna tabla, para descartar las guardadas
+    VERSION_TABLAS = 1
+
+    def __init__(self, rows: int, cols: int, paredes, goals, semilla: int = 0, tablas=None):
+        """
+        Args:
+            rows (int): cantidad de filas del tablero
+            cols (int): cantidad de columnas del tablero
+            paredes (iterable): posiciones (i, j) de las paredes
+            goals (iterable): posiciones (i, j) de los goals
+            semilla (int): semilla de las claves de Zobrist
+            tablas (dict): tablas ya calculadas con `tablas_estaticas`, que
+            se usan en lugar de calcularlas
+        """
+        self.rows = rows
+        self.cols = cols
+
+        self.paredes = bytearray(rows * cols)
+        for i, j in paredes:
+            self.paredes[self.indice(i, j)] = 1
+
+        self.goals = frozenset(self.indice(i, j) for i, j in goals)
+        self.goals_pos = sorted(self.posicion(g) for g in self.goals)
+        self.semilla = semilla
+        # tablas de otro tablero (por ejemplo de un archivo dañado) se ignoran
+        self._tablas = tablas if tablas and self._tablas_validas(tablas) else {}
+
+        # desplazamiento del indice lineal para cada movimiento
+        self.direcciones = {"u": -cols, "d": cols, "l": -1, "r": 1}
+
+    @functools.cached_property
+    def casillas_muertas(self) -> bytearray:
+        """Casillas desde las que una caja nunca puede llegar a un goal."""
+        if "casillas_muertas" in self._tablas:
+            return bytearray(self._tablas["casillas_muertas"])
+        return self._calcular_casillas_muertas()
+
+    @functools.cached_property
+    def _zobrist(self) -> tuple:
+        # claves de Zobrist de 64 bits: el hash de un estado es el XOR de las
+        # claves de las casillas con caja y de la casilla del jugador
+        if "zobrist_cajas" in self._tablas:
+            return self._tablas["zobrist_cajas"].tolist(), self._tablas["zobrist_jugador"].tolist()
+        generador = random.Random(self.semilla)
+        n = self.rows * self.cols
+        return [generador.getrandbits(64) for _ in range(n)], [generador.getrandbits(64) for _ in range(n)]
+
+    @functools.cached_property
+    def zobrist_cajas(self) -> list:
+        """Clave de Zobrist de cada casilla cuando tiene una caja."""
+        return self._zobrist[0]
+
+    @functools.cached_property
+    def zobrist_jugador(self) -> list:
+        """Clave de Zobrist de cada casilla cuando tiene al jugador."""
+        return self._zobrist[1]
+
+    @functools.cached_property
+    def distancia_manhattan_goal(self) -> list:
+        """Distancia manhattan de cada casilla al goal mas cercano."""
+        if "distancia_manhattan_goal" in self._tablas:
+            return self._tablas["distancia_manhattan_goal"].tolist()
+        return [
+            min((abs(i - gi) + abs(j - gj) for gi, gj in self.goals_pos), default=0)
+            for i in range(self.rows) for j in range(self.cols)
+        ]
+
+    def indice(self, i: int, j: int) -> int:
+        """Convierte una posicion (fila, columna) en indice lineal."""
+        return i * self.cols + j
+
+    def posicion(self, p: int) -> tuple:
+        """Convierte un indice lineal en una posicion (fila, columna)."""
+        return divmod(p, self.cols)
+
+    def hash_cajas(self, boxes) -> int:
+        """Calcula de cero la parte del hash de Zobrist de las cajas.
+
+        Args:
+            boxes (iterable): indices de las cajas
+
+        Returns:
+            int: XOR de las claves de las casillas con caja
+        """
+        h = 0
+        for box in boxes:
+            h ^= self.zobrist_cajas[box]
+        return h
+
+    def es_pared(self, i: int, j: int) -> bool:
+        """Indica si la posicion (fila, columna) es una pared."""
+        return self.paredes[self.indice(i, j)] == 1
+
+    @functools.cached_property
+    def costos_empuje(self) -> list:
+        """Minima cantidad de empujes para llevar una caja de cada casilla a
+        cada goal, ignorando las demas cajas. Se calcula con un recorrido en
+        anchura "tirando" de la caja desde cada goal, solo si se usa.
+
+        Returns:
+            list: por casilla, tupla con el costo a cada goal (en el orden de
+            `goals_pos`), INFINITO si es inalcanzable
+        """
+        if "costos_empuje" in self._tablas:
+            # se guardan aplanados, INFINITO como 0xFFFF
+            costos = [c if c != 0xFFFF else INFINITO for c in self._tablas["costos_empuje"]]
+            goals = len(self.goals)
+            if not goals:
+                return [()] * len(self.paredes)
+            return [tuple(costos[p:p + goals]) for p in range(0, len(costos), goals)]
+        paredes = self.paredes
+        distancias = []
+        for goal in sorted(self.goals):
+            distancia = [INFINITO] * len(paredes)
+            distancia[goal] = 0
+            pendientes = [goal]
+            for c in pendientes:
+                for d in self.direcciones.values():
+                    if distancia[c + d] != INFINITO or paredes[c + d] or paredes[c + 2 * d]:
+                        continue
+                    distancia[c + d] = distancia[c] + 1
+                    pendientes.append(c + d)
+            distancias.append(distancia)
+        if not distancias:
+            return [()] * len(paredes)
+        return [tuple(costos) for costos in zip(*distancias)]
+
+    @functools.cached_property
+    def mascara_paredes(self) -> int:
+        """Bitboard de las paredes: bit `p` en 1 si la casilla `p` es pared."""
+        return self.mascara(p for p, pared in enumerate(self.paredes) if pared)
+
+    @functools.cached_property
+    def mascara_piso(self) -> int:
+        """Bitboard de las casillas del tablero que no son pared."""
+        return self.mascara(p for p, pared in enumerate(self.paredes) if not pared)
+
+    @functools.cached_property
+    def mascara_goals(self) -> int:
+        """Bitboard de los goals."""
+        return self.mascara(self.goals)
+
+    @functools.cached_property
+    def mascara_muertas(self) -> int:
+        """Bitboard de las casillas muertas que no son pared."""
+        return self.mascara(
+            p for p, muerta in enumerate(self.casillas_muertas) if muerta and not self.paredes[p]
+        )
+
+    @staticmethod
+    def mascara(indices) -> int:
+        """Convierte indices lineales en un bitboard.
+
+        Args:
+            indices (iterable): indices lineales
+
+        Returns:
+            int: entero con un bit en 1 por cada indice
+        """
+        m = 0
+        for p in indices:
+            m |= 1 << p
+        return m
+
+    def _calcular_casillas_muertas(self) -> bytearray:
+        """Calcula las casillas muertas del nivel: aquellas desde las que una
+        caja no puede llegar a ningun goal aunque no hubiera otras cajas.
+
+        Se recorre el tablero "tirando" de una caja desde cada goal: la caja
+        puede pasar de `c` a `c + d` si el jugador tiene lugar en `c + d` y en
+        `c + 2d` para retroceder. Las casillas no alcanzadas estan muertas.
+        Cubre las esquinas y las paredes sin goals, entre otros casos.
+
+        Returns:
+            bytearray: 1 en las casillas muertas (y en las paredes)
+        """
+        paredes = self.paredes
+        vivas = bytearray(len(paredes))
+        pendientes = list(self.goals)
+        for g in pendientes:
+            vivas[g] = 1
+        for c in pendientes:
+            for d in self.direcciones.values():
+                if vivas[c + d] or paredes[c + d] or paredes[c + 2 * d]:
+                    continue
+                vivas[c + d] = 1
+                pendientes.append(c + d)
+        return bytearray(1 - v for v in vivas)
+
+    def _tablas_validas(self, tablas: dict) -> bool:
+        """Indica si las tablas tienen el tamaño que corresponde al tablero."""
+        n = self.rows * self.cols
+        largos = {
+            "casillas_muertas": n, "distancia_manhattan_goal": n, "costos_empuje": n * len(self.goals),
+            "zobrist_cajas": n, "zobrist_jugador": n,
+        }
+        return all(len(tablas.get(nombre, ())) == largo for nombre, largo in largos.items())
+
+    def tablas_estaticas(self) -> dict:
+        """Calcula las tablas del nivel y las devuelve en formato compacto
+        (arrays de enteros) para guardarlas.
+
+        Returns:
+            dict: tablas por nombre, cada una un `array.array`
+        """
+        # los costos de empuje se guardan aplanados, INFINITO como 0xFFFF
+        costos = array.array("H", (
+            c if c < INFINITO else 0xFFFF for fila in self.costos_empuje for c in fila
+        ))
+        return {
+            "casillas_muertas": array.array("B", self.casillas_muertas),
+            "distancia_manhattan_goal": array.array("H", self.distancia_manhattan_goal),
+            "costos_empuje": costos,
+            "zobrist_cajas": array.array("Q", self.zobrist_cajas),
+            "zobrist_jugador": array.array("Q", self.zobrist_jugador),
+        }
@@ -0,0 +1,141 @@
+import multiprocessing
+import queue
+import time
+
+from .trabajador import copiar_config
+
+
+# Estrategias usadas si la configuración no define `portfolio`
+PORTFOLIO_DEFECTO = [
+    {"algoritmo": "dfs"},
+    {"algoritmo": "a_star", "heuristicas": ["matching"], "expansion": "empujes"},
+    {"algoritmo": "greedy", "heuristicas": ["matching"], "expansion": "empujes"},
+    {"algoritmo": "bidireccional"},
+]
+
+# segundos entre consultas a la cola de resultados
+INTERVALO = 0.05
+
+
+def _correr_estrategia(indice: int, root, config, cola):
+    """Proceso de una estrategia: resuelve el nivel y envia por la cola sus
+    movimientos y estadisticas (no el estado, para no serializar la historia).
+    """
+    from .tree import recorre_arbol
+
+    try:
+        results = recorre_arbol(root, config)
+    except Exception as e:
+        cola.put((indice, {"estado": "error", "error": repr(e)}))
+        return
+    if results["solucion"].is_finished():
+        estado = "resuelto"
+    elif results.get("presupuesto_excedido"):
+        estado = "presupuesto_excedido"
+    else:
+        estado = "sin_solucion"
+    cola.put((indice, {
+        "estado": estado,
+        "presupuesto_excedido": results.get("presupuesto_excedido"),
+        "mejor_h": results.get("mejor_h"),
+        "tiempo": results["tiempo"],
+        "nodos_explorados": results["nodos_explorados"],
+        "nodos_generados": results["nodos_generados"],
+        "profundidad_maxima": results["profundidad_maxima"],
+        "movimientos": results["movimientos"],
+    }))
+
+
+def portfolio(root, config):
+    """Corre varias estrategias de busqueda en paralelo, una por proceso, sobre
+    el mismo nivel. Las estrategias se definen en `config.portfolio` como una
+    lista de diccionarios con los campos de configuración a reemplazar.
+
+    Sin `config.portfolio_deadline` gana la primera solucion encontrada. Con
+    un limite en segundos se espera hasta el limite (o a que terminen todas)
+    y se elige la solucion mas corta; si al llegar al limite no hay ninguna,
+    gana la primera que aparezca. Los procesos restantes se terminan. Si
+    ninguna resuelve el nivel y alguna excede su presupuesto, se devuelve el
+    estado con menor heuristica de esas estrategias.
+
+    Args:
+        root (Sokoban): estado inicial del juego.
+        config (module): configuración de la busqueda.
+
+    Returns:
+        dict: resultados de la estrategia ganadora, la estrategia usada y el
+        estado final de cada una.
+    """
+    t_inicial = time.time()
+    estrategias = getattr(config, "portfolio", PORTFOLIO_DEFECTO)
+    deadline = getattr(config, "portfolio_deadline", None)
+    configs = [copiar_config(config, estrategia) for estrategia in estrategias]
+    if any(c.algoritmo == "portfolio" for c in configs):
+        raise ValueError("Algoritmo Invalido")
+
+    root = root.as_root()
+    cola = multiprocessing.Queue()
+    procesos = [
+        multiprocessing.Process(target=_correr_estrategia, args=(i, root, c, cola), daemon=True)
+        for i, c in enumerate(configs)
+    ]
+    for proceso in procesos:
+        proceso.start()
+
+    resultados = [{"estado": "cancelada"} for _ in estrategias]
+    limite = t_inicial + deadline if deadline is not None else None
+    pendientes = len(procesos)
+    mejor = None
+    try:
+        while pendientes:
+            if mejor is not None and (limite is None or time.time() >= limite):
+                break
+            try:
+                indice, resultado = cola.get(timeout=INTERVALO)
+            except queue.Empty:
+                # un proceso que murio sin responder no se espera
+                if not any(p.is_alive() for p in procesos) and cola.empty():
+                    break
+                continue
+            pendientes -= 1
+            resultados[indice] = resultado
+            if resultado["estado"] != "resuelto":
+                continue
+            if mejor is None or len(resultado["movimientos"]) < len(resultados[mejor]["movimientos"]):
+                mejor = indice
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive():
+                proceso.terminate()
+        for proceso in procesos:
+            proceso.join()
+
+    excedidas = [i for i, r in enumerate(resultados) if r["estado"] == "presupuesto_excedido"]
+    if mejor is None and excedidas:
+        # ninguna resolvio: se devuelve el estado mas prometedor de las que
+        # excedieron su presupuesto
+        ganadora = resultados[min(excedidas, key=lambda i: resultados[i]["mejor_h"])]
+        solucion = root.apply_moves(ganadora["movimientos"])
+    elif mejor is None:
+        solucion = root
+        ganadora = {
+            "nodos_explorados": 0, "nodos_generados": 0, "profundidad_maxima": 0,
+            "presupuesto_excedido": None, "mejor_h": float("inf"),
+        }
+    else:
+        ganadora = resultados[mejor]
+        solucion = root.apply_moves(ganadora["movimientos"])
+        if config.verbose: print("Solucion Encontrada con {}".format(estrategias[mejor]))
+
+    return {
+        "tiempo": time.time() - t_inicial,
+        "nodos_explorados": ganadora["nodos_explorados"],
+        "nodos_generados": ganadora["nodos_generados"],
+        "profundidad_maxima": ganadora["profundidad_maxima"],
+        "solucion": solucion,
+        "movimientos": solucion.movements,
+        "estrategia": estrategias[mejor] if mejor is not None else None,
+        "estrategias": resultados,
+        "presupuesto_excedido": ganadora["presupuesto_excedido"],
+        "mejor_h": ganadora["mejor_h"],
+    }
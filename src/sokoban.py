@@ -1,11 +1,72 @@
+import functools
+
 import numpy as np
 
+from .matching import INFINITO, asignacion_greedy, costo_asignacion, hungaro
+from .nivel import Nivel
+
+
+# Heuristicas disponibles por nombre. Se registran con `registrar_heuristica`
+# y reciben el estado a evaluar.
+HEURISTICAS = {}
+
+
+def registrar_heuristica(nombre: str):
+    """Decorador que registra una funcion como heuristica con el nombre dado.
+
+    Args:
+        nombre (str): nombre con el que se la elige en `config.heuristicas`
+    """
+    def decorador(funcion):
+        HEURISTICAS[nombre] = funcion
+        return funcion
+    return decorador
+
+
+@functools.lru_cache(maxsize=None)
+def _resolver_heuristica(nombres: tuple):
+    for nombre in nombres:
+        if nombre not in HEURISTICAS:
+            raise ValueError("Heuristica Invalida: {}".format(nombre))
+    funciones = [HEURISTICAS[nombre] for nombre in nombres]
+
+    def heuristica(state):
+        if state._h_funcion is heuristica:
+            return state._h_valor
+        valor = max(f(state) for f in funciones) if funciones else 0
+        state._h_funcion = heuristica
+        state._h_valor = valor
+        return valor
+
+    return heuristica
+
+
+def resolver_heuristica(nombres):
+    """Resuelve una combinacion de heuristicas a una unica funcion que
+    devuelve el maximo de ellas. La resolucion se hace una vez por
+    combinacion y el valor queda guardado en cada estado evaluado.
+
+    Args:
+        nombres (list): nombres de las heuristicas a combinar
+
+    Raises:
+        ValueError: si alguna heuristica no esta registrada
+
+    Returns:
+        callable: funcion que recibe un estado y devuelve su heuristica
+    """
+    return _resolver_heuristica(tuple(nombres or ()))
+
 
 class Sokoban:
     """
     Clase que representa el tablero del juego Sokoban como un estado.
     En caso de que se realice una modificación (movimiento), se devuelve una
     nueva instancia de la clase como si fuera un nuevo estado.
+
+    El estado solo guarda la posicion del jugador y de las cajas (como indices
+    lineales). Las paredes y los goals viven en el `Nivel`, que se comparte
+    entre todos los estados.
     """
 
     PLAYER = "@"
@@ -16,126 +77,242 @@ class Sokoban:
     GOAL_AND_BOX = "*"
     GOAL_AND_PLAYER = "+"
 
-    def __init__(self):
-        """Inicializa datos de la clase"""
-        self.player = None
-        self.boxes = []
-        self.goals = []
-        self.grid = np.array([])
-        self.movements = ""
+    __slots__ = (
+        "nivel", "_player", "_boxes", "parent", "last_move", "g",
+        "_region", "_moved_box", "_h_funcion", "_h_valor", "_matching", "_hash_cajas",
+    )
 
-    def parse_grid(self, grid: str) -> np.ndarray:
-        """Transforma el tablero de juego en un array de numpy
+    def __init__(self, nivel=None, player=None, boxes=(), parent=None, last_move="", g=0,
+                 moved_box=None, hash_cajas=None):
+        """Inicializa datos de la clase
 
         Args:
-            grid (str): tablero en formato ASCII de acuerdo a http://www.game-sokoban.com/
+            nivel (Nivel): parte estatica del tablero
+            player (int): indice lineal del jugador
+            boxes (tuple): indices lineales ordenados de las cajas
+            parent (Sokoban): estado previo, None para el estado inicial
+            last_move (str): movimiento realizado desde el estado previo
+            g (int): cantidad de pasos desde el estado inicial
+            moved_box (int): indice de la caja empujada en el ultimo movimiento
+            hash_cajas (int): hash de Zobrist de las cajas, se calcula si es None
+        """
+        self.nivel = nivel
+        self._player = player
+        self._boxes = boxes
+        self.parent = parent
+        self.last_move = last_move
+        self.g = g
+        self._region = None
+        self._moved_box = moved_box
+        self._h_funcion = None
+        self._h_valor = 0
+        self._matching = None
+        if hash_cajas is None and nivel is not None:
+            hash_cajas = nivel.hash_cajas(boxes)
+        self._hash_cajas = hash_cajas
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Sokoban)
+            and self._player == other._player
+            and self._boxes == other._boxes
+        )
+
+    def __hash__(self):
+        return self.get_key()
+
+    @property
+    def movements(self) -> str:
+        """Movimientos realizados desde el estado inicial. Se reconstruyen
+        recorriendo los estados previos, por lo que tiene costo O(profundidad).
+        """
+        movimientos = []
+        state = self
+        while state.parent is not None:
+            movimientos.append(state.last_move)
+            state = state.parent
+        return "".join(reversed(movimientos))
+
+    def as_root(self, clase=None):
+        """Devuelve el mismo estado sin historia, para usarlo como raiz de una
+        busqueda.
+
+        Args:
+            clase (type): representacion del estado a usar (por ejemplo
+                `SokobanBitboard`), por defecto la misma
 
         Returns:
-            np.ndarray: tablero de juego en formato de array de numpy
+            Sokoban: estado sin estados previos
+        """
+        clase = clase or type(self)
+        boxes = clase._codificar_cajas(self._box_indices())
+        return clase(self.nivel, self._player, boxes, hash_cajas=self._hash_cajas)
+
+    @staticmethod
+    def _codificar_cajas(indices) -> tuple:
+        """Convierte indices de cajas a la representacion interna del estado."""
+        return tuple(sorted(indices))
+
+    def _box_indices(self) -> tuple:
+        """Indices lineales ordenados de las cajas."""
+        return self._boxes
+
+    def _has_box(self, p: int) -> bool:
+        """Indica si hay una caja en el indice lineal dado."""
+        return p in self._boxes
+
+    @property
+    def player(self) -> tuple:
+        """Posicion (fila, columna) del jugador"""
+        if self._player is None:
+            return None
+        return self.nivel.posicion(self._player)
+
+    @property
+    def boxes(self) -> list:
+        """Posiciones (fila, columna) de las cajas"""
+        if self.nivel is None:
+            return []
+        return [self.nivel.posicion(b) for b in self._box_indices()]
+
+    @property
+    def goals(self) -> list:
+        """Posiciones (fila, columna) de los goals"""
+        if self.nivel is None:
+            return []
+        return list(self.nivel.goals_pos)
+
+    @property
+    def grid(self) -> np.ndarray:
+        """Tablero de juego en formato de array de numpy. Se construye a
+        pedido, no se usa durante la busqueda.
+        """
+        if self.nivel is None:
+            return np.array([])
+        nivel = self.nivel
+        grid = np.full((nivel.rows, nivel.cols), self.EMPTY)
+        grid[np.array(nivel.paredes, dtype=bool).reshape(nivel.rows, nivel.cols)] = self.WALL
+        for i, j in self.boxes:
+            grid[i, j] = self.BOX
+        if self._player is not None:
+            grid[self.player] = self.PLAYER
+        return grid
+
+    def parse_grid(self, grid: str, tablas=None):
+        """Transforma el tablero de juego en el nivel y el estado inicial
+
+        Args:
+            grid (str): tablero en formato ASCII de acuerdo a http://www.game-sokoban.com/
+            tablas (dict): tablas estaticas del nivel ya calculadas (ver `Nivel`)
         """
         gridlines = grid.split("\n")
         rows = len(gridlines)
         cols = max([len(row) for row in gridlines])
-        self.grid = np.full((rows, cols), self.EMPTY)
+        paredes, goals, boxes, player = [], [], [], None
         for i, row in enumerate(gridlines):
             for j, cell in enumerate(row):
                 if cell == self.WALL:
-                    self.grid[i, j] = self.WALL
+                    paredes.append((i, j))
                 elif cell in self.BOX:
-                    self.grid[i, j] = self.BOX
-                    self.boxes.append((i, j))
+                    boxes.append((i, j))
                 elif cell == self.GOAL:
-                    self.goals.append((i, j))
+                    goals.append((i, j))
                 elif cell == self.GOAL_AND_BOX:
-                    self.grid[i, j] = self.BOX
-                    self.boxes.append((i, j))
-                    self.goals.append((i, j))
+                    boxes.append((i, j))
+                    goals.append((i, j))
                 elif cell == self.PLAYER:
-                    self.grid[i, j] = self.PLAYER
-                    self.player = (i, j)
-                    gridlines = grid.split("\n")
+                    player = (i, j)
                 elif cell == self.GOAL_AND_PLAYER:
-                    self.grid[i, j] = self.GOAL
-                    self.goals.append((i, j))
-                    self.player = (i, j)
-
-                
-
-    def _move(self, x: int, y: int):
+                    goals.append((i, j))
+                    player = (i, j)
+
+        self.nivel = Nivel(rows, cols, paredes, goals, tablas=tablas)
+        self._player = self.nivel.indice(*player) if player else None
+        self._boxes = tuple(sorted(self.nivel.indice(i, j) for i, j in boxes))
+        self.parent = None
+        self.last_move = ""
+        self.g = 0
+        self._region = None
+        self._moved_box = None
+        self._h_funcion = None
+        self._h_valor = 0
+        self._matching = None
+        self._hash_cajas = self.nivel.hash_cajas(self._boxes)
+
+    def _move(self, x: int, y: int, move: str):
         """Mueve el jugador en la dirección indicada.
 
         Args:
             x (int): movimiento en horizontal
             y (int): movimiento en vertical
+            move (str): letra del movimiento (u, d, l, r)
 
         Returns:
             Sokoban: nueva instancia del tablero o None si el movimiento es inválido
         """
-        i, j = self.player
+        paredes = self.nivel.paredes
+        d = x * self.nivel.cols + y
+        p = self._player + d
 
-        invalid_moves = [
-            self.grid[i + x, j + y] == self.WALL,
-            self.grid[i + x, j + y] == self.BOX
-            and self.grid[i + 2 * x, j + 2 * y] == self.WALL,
-            self.grid[i + x, j + y] == self.BOX
-            and self.grid[i + 2 * x, j + 2 * y] == self.BOX,
-        ]
-        if any(invalid_moves):
+        if paredes[p]:
             return
 
+        boxes = self._boxes
+        moved_box = None
+        hash_cajas = self._hash_cajas
+        if p in boxes:
+            q = p + d
+            if paredes[q] or q in boxes:
+                return
+            boxes = tuple(sorted(q if b == p else b for b in boxes))
+            moved_box = q
+            zobrist = self.nivel.zobrist_cajas
+            hash_cajas ^= zobrist[p] ^ zobrist[q]
+
         # Crea una nueva instancia del tablero con el movimiento ejecutado
-        other = Sokoban()
-        other.grid = self.grid.copy()
-        other.boxes = self.boxes.copy()
-        other.goals = self.goals.copy()
-        other.player = self.player
-        other.movements = self.movements
-
-        if other.grid[i + x, j + y] == self.BOX:
-            other.grid[i + 2 * x, j + 2 * y] = self.BOX
-            box_index = other.boxes.index((i + x, j + y))
-            other.boxes[box_index] = (i + 2 * x, j + 2 * y)
-
-        other.grid[i, j] = self.EMPTY
-        other.grid[i + x, j + y] = self.PLAYER
-        other.player = (i + x, j + y)
-        return other
+        return Sokoban(self.nivel, p, boxes, self, move, self.g + 1, moved_box, hash_cajas)
 
     def move_up(self):
         """Mueve el jugador hacia arriba y devuelve una nueva clase.
         Si es imposible realizar el movimiento, devuelve None.
         """
-        other = self._move(-1, 0)
-        if other:
-            other.movements += "u"
-        return other
+        return self._move(-1, 0, "u")
 
     def move_down(self):
         """Mueve el jugador hacia abajo y devuelve una nueva clase.
         Si es imposible realizar el movimiento, devuelve None.
         """
-        other = self._move(1, 0)
-        if other:
-            other.movements += "d"
-        return other
+        return self._move(1, 0, "d")
 
     def move_left(self):
         """Mueve el jugador hacia la izquierda y devuelve una nueva clase.
         Si es imposible realizar el movimiento, devuelve None.
         """
-        other = self._move(0, -1)
-        if other:
-            other.movements += "l"
-        return other
+        return self._move(0, -1, "l")
 
     def move_right(self):
         """Mueve el jugador hacia la derecha y devuelve una nueva clase.
         Si es imposible realizar el movimiento, devuelve None.
         """
-        other = self._move(0, 1)
-        if other:
-            other.movements += "r"
-        return other
+        return self._move(0, 1, "r")
+
+    def apply_moves(self, movements: str):
+        """Aplica una secuencia de movimientos ("u", "d", "l", "r") y devuelve
+        el estado resultante, con la historia encadenada a este estado.
+
+        Args:
+            movements (str): movimientos a aplicar
+
+        Returns:
+            Sokoban: estado final, None si algun movimiento es imposible
+        """
+        state = self
+        desplazamientos = {"u": (-1, 0), "d": (1, 0), "l": (0, -1), "r": (0, 1)}
+        for move in movements:
+            state = state._move(*desplazamientos[move], move)
+            if state is None:
+                return None
+        return state
 
     def get_possible_moves(self):
         """Devuelve una lista con los posibles movimientos para cambiar a otro
@@ -152,111 +329,256 @@ class Sokoban:
         ]
 
 
+    def _reachable(self) -> dict:
+        """Flood fill de las celdas a las que llega el jugador sin empujar
+        cajas. Se recorre en anchura, por lo que los caminos son minimos.
+
+        Returns:
+            dict: celda alcanzable -> (celda previa, movimiento para llegar)
+        """
+        paredes = self.nivel.paredes
+        boxes = self._boxes
+        direcciones = self.nivel.direcciones.items()
+        previo = {self._player: (None, "")}
+        pendientes = [self._player]
+        for p in pendientes:
+            for move, d in direcciones:
+                q = p + d
+                if q in previo or paredes[q] or q in boxes:
+                    continue
+                previo[q] = (p, move)
+                pendientes.append(q)
+        return previo
+
+    @staticmethod
+    def _path_to(previo: dict, destino: int) -> str:
+        """Reconstruye el camino del jugador hasta una celda alcanzable.
+
+        Args:
+            previo (dict): resultado de `_reachable`
+            destino (int): celda de destino
+
+        Returns:
+            str: movimientos para llegar a la celda
+        """
+        camino = []
+        p, move = previo[destino]
+        while p is not None:
+            camino.append(move)
+            p, move = previo[p]
+        return "".join(reversed(camino))
+
+    def get_possible_pushes(self) -> list:
+        """Devuelve los estados que resultan de empujar una caja. El jugador
+        camina hasta la caja por el camino mas corto y la empuja una celda, de
+        modo que cada estado nuevo difiere en un solo empuje.
+
+        Returns:
+            list: estados alcanzables con un empuje
+        """
+        nivel = self.nivel
+        paredes = nivel.paredes
+        previo = self._reachable()
+        sucesores = []
+        for box in self._boxes:
+            for move, d in nivel.direcciones.items():
+                origen, destino = box - d, box + d
+                if origen not in previo or paredes[destino] or destino in self._boxes:
+                    continue
+                camino = self._path_to(previo, origen) + move
+                boxes = tuple(sorted(destino if b == box else b for b in self._boxes))
+                hash_cajas = self._hash_cajas ^ nivel.zobrist_cajas[box] ^ nivel.zobrist_cajas[destino]
+                sucesores.append(Sokoban(
+                    nivel, box, boxes, self, camino, self.g + len(camino), destino, hash_cajas
+                ))
+        return sucesores
+
+
+    def get_successors(self, por_empujes: bool = False) -> list:
+        """Devuelve los estados validos que se alcanzan desde este.
+
+        Args:
+            por_empujes (bool): expandir por empujes de cajas en lugar de por
+                pasos del jugador
+
+        Returns:
+            list: estados sucesores
+        """
+        if por_empujes:
+            return self.get_possible_pushes()
+        return [other for other in (move() for move in self.get_possible_moves()) if other]
+
+
+    def get_key(self, normalizado: bool = False) -> int:
+        """Devuelve una clave canonica y hasheable del estado: el hash de
+        Zobrist de 64 bits de las cajas y el jugador. La parte de las cajas se
+        actualiza con XOR en cada movimiento, sin recalcularse.
+
+        Dos estados con el jugador en la misma posicion y las mismas cajas
+        (sin importar el orden) tienen la misma clave. Con `normalizado` se
+        usa la menor celda alcanzable por el jugador en lugar de su posicion,
+        por lo que todos los estados que solo difieren en pasos sin empujar
+        comparten clave (busqueda por empujes).
+
+        Args:
+            normalizado (bool): usar la region alcanzable del jugador
+
+        Returns:
+            int: hash de Zobrist del estado
+        """
+        return self._hash_cajas ^ self.nivel.zobrist_jugador[self._get_player_key(normalizado)]
+
+
+    def get_full_key(self, normalizado: bool = False) -> tuple:
+        """Clave completa del estado, sin colisiones posibles. Se usa para
+        verificar las claves de Zobrist.
+
+        Args:
+            normalizado (bool): usar la region alcanzable del jugador
+
+        Returns:
+            tuple: indice del jugador (o de su region) e indices ordenados de las cajas
+        """
+        return (self._get_player_key(normalizado), self._box_indices())
+
+
+    def _get_player_key(self, normalizado: bool) -> int:
+        if not normalizado:
+            return self._player
+        if self._region is None:
+            self._region = min(self._reachable())
+        return self._region
+
+
     def is_finished(self) -> bool:
         """Verifica si el juego ha sido completado exitosamente.
 
         Returns:
             bool: indicador de si el juego ha sido completado exitosamente
         """
-        return all([box in self.goals for box in self.boxes])
+        return self.nivel.goals.issuperset(self._boxes)
 
 
-    def is_deadlocked(self) -> bool:
+    def is_deadlocked(self, incremental: bool = False) -> bool:
         """Verifica que el juego no se encuentre en un estado sin solución.
-        Esto significa que la caja se queda en una esquina y no puede ser movida.
+        Esto significa que alguna caja esta en una casilla muerta del nivel
+        (por ejemplo una esquina), quedo congelada fuera de un goal o forma
+        un bloque de 2x2 con paredes y otras cajas.
+
+        Args:
+            incremental (bool): revisar solo la caja empujada en el ultimo
+                movimiento. Lo usa la busqueda, donde el estado previo ya
+                fue verificado.
 
         Returns:
             bool: indicador de si el juego está en un estado sin solución
         """
+        if incremental:
+            if self._moved_box is None:
+                return False
+            return self._is_box_deadlocked(self._moved_box)
+        return any(self._is_box_deadlocked(box) for box in self._box_indices())
 
-        if self.is_finished(): return False
 
-        for box in self.boxes:
-            # Es un deadlock si una caja llega a una esquina, se excluye cajas en esquinas que son GOAL
-            if self._is_in_corner(*box) and box not in self.goals:
-                return True
-            
-            # Es un deadlock si una caja queda sobre una pared y solo puede moverse sobre ella
-            if self._is_wall_deadlock(*box):
-                return True
-        
-        # Si llegamos aca no hay deadlock
-        return False
+    def _is_box_deadlocked(self, box: int) -> bool:
+        """Verifica si una caja (y sus vecinas) dejan el juego sin solución.
+
+        Args:
+            box (int): indice de la caja
+
+        Returns:
+            bool: indicador de deadlock
+        """
+        if self.nivel.casillas_muertas[box]:
+            return True
+        return self._is_freeze_deadlock(box) or self._is_block_deadlock(box)
 
 
-    def _is_in_corner(self, i:int, j:int):
-        """dada una posicion, indica si se encuentra en una esquina del tablero
+    def _is_freeze_deadlock(self, box: int) -> bool:
+        """Una caja esta congelada si no puede moverse ni en horizontal ni en
+        vertical, por paredes, casillas muertas u otras cajas congeladas. Es
+        deadlock si alguna de las cajas congeladas no esta en un goal.
 
         Args:
-            i (int): posicion horizontal
-            j (int): posicion vertical
+            box (int): indice de la caja
 
         Returns:
-            bool: indicacione si esta en el tablero
+            bool: indicador de deadlock
         """
-        if self.grid[i - 1, j] == self.WALL and self.grid[i, j - 1] == self.WALL:
-            return True
-        if self.grid[i - 1, j] == self.WALL and self.grid[i, j + 1] == self.WALL:
-            return True
-        if self.grid[i + 1, j] == self.WALL and self.grid[i, j - 1] == self.WALL:
+        congeladas = set()
+        if not self._is_frozen(box, set(), congeladas):
+            return False
+        return not self.nivel.goals.issuperset(congeladas)
+
+
+    def _is_frozen(self, box: int, marcadas: set, congeladas: set) -> bool:
+        """Indica si la caja no puede moverse en ningun eje.
+
+        Args:
+            box (int): indice de la caja
+            marcadas (set): cajas ya en analisis, se toman como paredes
+            congeladas (set): se agregan las cajas que resultan congeladas
+
+        Returns:
+            bool: indicador de si la caja esta congelada
+        """
+        marcadas.add(box)
+        congelada = (
+            self._is_blocked(box, 1, marcadas, congeladas)
+            and self._is_blocked(box, self.nivel.cols, marcadas, congeladas)
+        )
+        if congelada:
+            congeladas.add(box)
+        return congelada
+
+
+    def _is_blocked(self, box: int, eje: int, marcadas: set, congeladas: set) -> bool:
+        """Indica si la caja no puede moverse sobre un eje.
+
+        Args:
+            box (int): indice de la caja
+            eje (int): desplazamiento del eje (1 horizontal, cols vertical)
+            marcadas (set): cajas ya en analisis, se toman como paredes
+            congeladas (set): se agregan las cajas que resultan congeladas
+
+        Returns:
+            bool: indicador de si la caja esta bloqueada en el eje
+        """
+        paredes = self.nivel.paredes
+        muertas = self.nivel.casillas_muertas
+        antes, despues = box - eje, box + eje
+
+        if paredes[antes] or paredes[despues]:
             return True
-        if self.grid[i + 1, j] == self.WALL and self.grid[i, j + 1] == self.WALL:
+        if muertas[antes] and muertas[despues]:
             return True
+        for vecina in (antes, despues):
+            if vecina in marcadas:
+                return True
+            if self._has_box(vecina) and self._is_frozen(vecina, marcadas, congeladas):
+                return True
         return False
-    
 
-    def _is_wall_deadlock(self, i:int, j:int):
-        """Verifica que la caja esta en una posicion donde es imposible llevarla
-        hacia un goal. Por ejemplo debajos se ve que la caja ($) es imposible
-        llevarla al goal (.)
 
-        #########
-        #    $  #
-        #  .    #
+    def _is_block_deadlock(self, box: int) -> bool:
+        """Verifica si la caja forma un bloque de 2x2 de paredes y cajas con
+        alguna caja fuera de un goal.
 
         Args:
-            i (int): posicion horizontal de la caja
-            j (int): posicion vertical de la caja
-        """
-        grid = self.grid
-
-        # Horizontal
-        l_offset = 0
-        r_offset = 0
-        while True:
-            move_r_offset = 1 if grid[i, j + r_offset] != self.WALL else 0
-            move_l_offset = 1 if grid[i, j - l_offset] != self.WALL else 0
-            r_offset += move_r_offset
-            l_offset += move_l_offset
-            if move_l_offset == 0 and move_r_offset == 0:
-                break
-
-        all_wall_up   = all(grid[i-1, j-l_offset+1:j+r_offset] == self.WALL)
-        all_wall_down = all(grid[i+1, j-l_offset+1:j+r_offset] == self.WALL)
-        goal_in_row = any([(g[0] == i) and (j-l_offset+1 <= g[1] <= j+r_offset) for g in self.goals])
-
-        if (not goal_in_row and all_wall_down) or (not goal_in_row and all_wall_up):
-            return True
+            box (int): indice de la caja
 
-        # Vertical
-        u_offset = 0
-        d_offset = 0
-        while True:
-            move_u_offset = 1 if grid[i - u_offset, j] != self.WALL else 0
-            move_d_offset = 1 if grid[i + d_offset, j] != self.WALL else 0
-            u_offset += move_u_offset
-            d_offset += move_d_offset
-            if move_u_offset == 0 and move_d_offset == 0:
-                break
-
-        all_wall_left  = all(grid[i-u_offset+1:i+d_offset , j-1] == self.WALL)
-        all_wall_right = all(grid[i-u_offset+1:i+d_offset , j+1] == self.WALL)
-        goal_in_row = any([(g[1] == j) and (i-u_offset+1 <= g[0] <= i+d_offset) for g in self.goals])
-
-        if (not goal_in_row and all_wall_left) or (not goal_in_row and all_wall_right):
-            return True
-
-        # En caso de que no sea deadlock
+        Returns:
+            bool: indicador de deadlock
+        """
+        paredes = self.nivel.paredes
+        goals = self.nivel.goals
+        cols = self.nivel.cols
+        for esquina in (box, box - 1, box - cols, box - cols - 1):
+            bloque = (esquina, esquina + 1, esquina + cols, esquina + cols + 1)
+            if not all(paredes[c] or c in self._boxes for c in bloque):
+                continue
+            if any(c in self._boxes and c not in goals for c in bloque):
+                return True
         return False
 
 
@@ -268,7 +590,7 @@ class Sokoban:
             int: costo del nodo actual
 
         """
-        return len(self.movements)
+        return self.g
     
 
     def get_heuristic(self, heuristics_names):
@@ -280,40 +602,149 @@ class Sokoban:
         Returns:
             int: posible costo hasta alcanzar la solucion
         """
-
-        if not heuristics_names: # si no se pasa una heuristica retorna 0
-            return 0
-
-        valores_heuristica = []
-        for heuristica_name in heuristics_names:
-            heuristica = getattr(self, "heuristica_{}".format(heuristica_name))
-            valores_heuristica.append(heuristica())
-
-        return max(valores_heuristica)
+        return resolver_heuristica(heuristics_names)(self)
     
 
+    @registrar_heuristica("manhattan")
     def heuristica_manhattan(self):
         """Distancia Manhattan para llevar todas las cajas a un goal.
 
         Heuristica 1 de la consigna
 
         Returns:
-            float: suma de la distancia o norma 0 entre caja y goal más proximo
+            int: suma de la distancia o norma 0 entre caja y goal más proximo
         """
-        goals = np.array(self.goals)
-        boxes = np.array(self.boxes)        
-        return sum([min([sum(abs(box - goal)) for goal in goals]) for box in boxes])
+        distancia = self.nivel.distancia_manhattan_goal
+        return sum(distancia[box] for box in self._box_indices())
 
 
+    @registrar_heuristica("distancia_a_caja")
     def heuristica_distancia_a_caja(self):
         """Devuelve la minima distancia del jugador a la caja fuera de lugar
 
         Heuristica 2 de la consigna
 
         Returns:
-            float: minima distancia a una caja fuera del goal.
+            int: minima distancia a una caja fuera del goal, 0 si no hay.
+        """
+        goals = self.nivel.goals
+        posicion = self.nivel.posicion
+        i, j = self.player
+        distancias = []
+        for box in self._box_indices():
+            if box in goals:
+                continue
+            bi, bj = posicion(box)
+            distancias.append(abs(i - bi) + abs(j - bj))
+        return min(distancias, default=0)
+
+
+    @registrar_heuristica("matching")
+    def heuristica_matching(self):
+        """Asignacion de costo minimo entre cajas y goals, usando la cantidad
+        real de empujes (respetando paredes) como costo de cada par. Cada
+        goal recibe a lo sumo una caja. Es admisible.
+
+        Returns:
+            int: cantidad minima de empujes para llevar las cajas a los goals
         """
-        boxes = np.array(self.boxes)
-        player = np.array(self.player)
-        goals = self.goals        
-        return min([sum(abs(box - player)) for box in boxes if box.tolist() not in goals])
+        return self._get_matching()[-1]
+
+
+    @registrar_heuristica("matching_greedy")
+    def heuristica_matching_greedy(self):
+        """Version aproximada de `heuristica_matching` que asigna primero los
+        pares caja-goal mas baratos. Es mas rapida pero no es admisible.
+
+        Returns:
+            int: costo de la asignacion greedy
+        """
+        costos = self.nivel.costos_empuje
+        return asignacion_greedy([costos[box] for box in self._box_indices()])
+
+
+    def _get_matching(self):
+        """Calcula (y guarda en el estado) la asignacion hungara de cajas a
+        goals. Si el estado previo ya la tiene y hay tantos goals como cajas,
+        se actualiza solo la fila de la caja empujada en lugar de resolverla
+        de cero.
+
+        Returns:
+            tuple: (u, v, p, costo) con los potenciales, la asignacion y su
+            costo; con mas cajas que goals, el costo es INFINITO
+        """
+        if self._matching is not None:
+            return self._matching
+
+        costos_empuje = self.nivel.costos_empuje
+        boxes = self._box_indices()
+        if len(boxes) > len(self.nivel.goals):
+            # con mas cajas que goals el nivel no tiene solucion
+            self._matching = (None, None, None, INFINITO)
+            return self._matching
+        costos = [costos_empuje[box] for box in boxes]
+        parent = self.parent
+        previo = parent._matching if parent is not None else None
+
+        if previo is not None and parent._boxes == self._boxes:
+            # el jugador se movio sin empujar cajas
+            self._matching = previo
+            return previo
+
+        # el arranque en caliente de `hungaro` solo es correcto con la matriz
+        # cuadrada
+        if previo is not None and self._moved_box is not None and len(boxes) == len(self.nivel.goals):
+            u_previo, v, p_previo, _ = previo
+            previas = parent._box_indices()
+            origen = (set(previas) - set(boxes)).pop()
+            # fila (1-indexado) de cada caja en el nuevo estado
+            fila = {box: i + 1 for i, box in enumerate(boxes)}
+            fila[origen] = fila.pop(self._moved_box)
+            nueva = [0] * len(p_previo)
+            for j, i in enumerate(p_previo):
+                if j and i and previas[i - 1] != origen:
+                    nueva[j] = fila[previas[i - 1]]
+            u = [0] * len(u_previo)
+            for i, box in enumerate(previas):
+                u[fila[box]] = u_previo[i + 1]
+            u, v, p = hungaro(costos, u, list(v), nueva, [fila[origen]])
+        else:
+            u, v, p = hungaro(costos)
+
+        self._matching = (u, v, p, costo_asignacion(costos, p))
+        return self._matching
+
+
+def verificar_colision(claves: dict, state, normalizado: bool = False):
+    """Verifica que la clave de Zobrist del estado no colisione con la de otro
+    estado distinto ya registrado. Solo se usa en modo de depuracion.
+
+    Args:
+        claves (dict): clave de Zobrist -> clave completa de los estados vistos
+        state (Sokoban): estado a verificar
+        normalizado (bool): usar la region alcanzable del jugador
+
+    Raises:
+        RuntimeError: si dos estados distintos comparten clave
+    """
+    completa = state.get_full_key(normalizado)
+    if claves.setdefault(state.get_key(normalizado), completa) != completa:
+        raise RuntimeError("Colision de claves de Zobrist: {} y {}".format(
+            claves[state.get_key(normalizado)], completa))
+
+
+def crear_verificador(config, normalizado: bool = False):
+    """Funcion que verifica las colisiones de claves de los estados de una
+    busqueda con `verificar_colision`, si `config.verificar_colisiones`.
+
+    Args:
+        config (module): configuración de la busqueda
+        normalizado (bool): usar la region alcanzable del jugador
+
+    Returns:
+        callable: funcion que recibe un estado, None si no se verifica
+    """
+    if not getattr(config, "verificar_colisiones", False):
+        return None
+    claves = {}
+    return lambda state: verificar_colision(claves, state, normalizado)
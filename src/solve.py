@@ -0,0 +1,204 @@
+"""
+Resolucion por lotes sin interfaz grafica.
+
+    python -m src.solve config/*.py --algo a_star greedy --heuristicas manhattan matching,manhattan --jobs 4
+    python -m src.solve niveles/microban.xsb --algo bidireccional --timeout 30
+
+Cada combinacion de nivel, algoritmo y heuristicas se resuelve en un proceso
+de un pool y, a medida que terminan, se imprime una linea JSON por tarea.
+Si no se indican algoritmos o heuristicas se usan los de cada archivo de
+configuración. Los niveles de las colecciones (.xsb, .sok, .txt) usan la
+configuración por defecto.
+"""
+import argparse
+import importlib.util
+import itertools
+import json
+import os
+import signal
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+from .colecciones import cargar_coleccion
+from .sokoban import Sokoban
+from .tree import recorre_arbol
+
+
+# extensiones de los archivos de colecciones de niveles
+EXTENSIONES_COLECCION = (".xsb", ".sok", ".txt")
+
+CONFIG_DEFECTO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_config.py")
+
+
+def cargar_config(path: str):
+    """Carga un archivo de configuración como modulo, sin tocar `sys.path`.
+
+    Args:
+        path (str): ruta al archivo .py
+
+    Returns:
+        module: configuración cargada
+    """
+    nombre = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(nombre, path)
+    config = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(config)
+    return config
+
+
+def _tiempo_agotado(signum, frame):
+    raise TimeoutError
+
+
+def resolver_tarea(tarea: dict) -> dict:
+    """Resuelve una tarea del lote. Se ejecuta en un proceso del pool.
+
+    El limite de tiempo se aplica con SIGALRM dentro del proceso, por lo que
+    en plataformas sin esa señal (Windows) las tareas no se interrumpen.
+
+    Args:
+        tarea (dict): nivel, algoritmo, heuristicas, expansion, backend,
+        cache y timeout (segundos, None sin limite)
+
+    Returns:
+        dict: la tarea con el estado ("resuelto", "sin_solucion",
+        "presupuesto_excedido", "tiempo_agotado" o "error") y las
+        estadisticas de la busqueda
+    """
+    resultado = dict(tarea)
+    # los niveles de colecciones llegan ya parseados, con sus tablas estaticas
+    root = resultado.pop("root", None)
+    config = cargar_config(tarea["nivel"] if root is None else CONFIG_DEFECTO)
+    config.verbose = False
+    for campo in ("algoritmo", "heuristicas", "expansion", "backend", "cache"):
+        if tarea[campo] is not None:
+            setattr(config, campo, tarea[campo])
+        resultado[campo] = getattr(config, campo, None)
+
+    alarma = tarea["timeout"] and hasattr(signal, "SIGALRM")
+    if alarma:
+        signal.signal(signal.SIGALRM, _tiempo_agotado)
+        signal.setitimer(signal.ITIMER_REAL, tarea["timeout"])
+    try:
+        if root is None:
+            root = Sokoban()
+            root.parse_grid(config.mapa)
+        results = recorre_arbol(root, config)
+    except TimeoutError:
+        resultado["estado"] = "tiempo_agotado"
+        return resultado
+    except Exception as e:
+        resultado["estado"] = "error"
+        resultado["error"] = repr(e)
+        return resultado
+    finally:
+        if alarma: signal.setitimer(signal.ITIMER_REAL, 0)
+
+    if results["solucion"].is_finished():
+        resultado["estado"] = "resuelto"
+    elif results.get("presupuesto_excedido"):
+        resultado["estado"] = "presupuesto_excedido"
+    else:
+        resultado["estado"] = "sin_solucion"
+    resultado.update({
+        "tiempo": results["tiempo"],
+        "nodos_explorados": results["nodos_explorados"],
+        "nodos_generados": results["nodos_generados"],
+        "profundidad_maxima": results["profundidad_maxima"],
+        "movimientos": results["movimientos"],
+        "longitud": len(results["movimientos"]),
+        "cache": results.get("cache", False),
+    })
+    return resultado
+
+
+def generar_tareas(niveles, algoritmos=None, heuristicas=None, expansion=None,
+                   backend=None, timeout=None, cache=None):
+    """Arma la matriz de tareas nivel x algoritmo x heuristicas. Las tareas se
+    generan de a una, para que los niveles de las colecciones se lean a
+    medida que el pool los necesita.
+
+    Args:
+        niveles (list): rutas a los archivos de configuración o de colecciones
+        algoritmos (list): algoritmos, None para usar el de cada nivel
+        heuristicas (list): combinaciones de heuristicas (listas de nombres),
+        None para usar las de cada nivel
+        expansion (str): "pasos" o "empujes", None para usar la del nivel
+        backend (str): representacion del estado, None para usar la del nivel
+        timeout (float): limite de segundos por tarea
+        cache (str): ruta de la cache de soluciones, None para usar la del nivel
+
+    Yields:
+        dict: tareas para `resolver_tarea`
+    """
+    for nivel in niveles:
+        # cada nivel de una coleccion es una tarea aparte, con el estado
+        # inicial; las tablas estaticas que no estan en la cache de la
+        # coleccion se calculan en el proceso que resuelve la tarea
+        if nivel.lower().endswith(EXTENSIONES_COLECCION):
+            expandidos = (
+                ("{}: {}".format(nivel, titulo), root) for titulo, root in cargar_coleccion(nivel, guardar=False)
+            )
+        else:
+            expandidos = [(nivel, None)]
+
+        for (nombre, root), algoritmo, combinacion in itertools.product(
+            expandidos, algoritmos or [None], heuristicas or [None]
+        ):
+            tarea = {
+                "nivel": nombre, "algoritmo": algoritmo, "heuristicas": combinacion,
+                "expansion": expansion, "backend": backend, "timeout": timeout, "cache": cache,
+            }
+            if root is not None: tarea["root"] = root
+            yield tarea
+
+
+def resolver_lote(tareas, jobs=None):
+    """Resuelve las tareas en un pool de procesos.
+
+    Las tareas se consumen a medida que se liberan procesos, con a lo sumo
+    dos tareas pendientes por proceso.
+
+    Args:
+        tareas (iterable): tareas de `generar_tareas`
+        jobs (int): cantidad de procesos, None para usar todos los nucleos
+
+    Yields:
+        dict: resultado de cada tarea, en el orden en que terminan
+    """
+    limite = 2 * (jobs or os.cpu_count() or 1)
+    pendientes = set()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for tarea in tareas:
+            if len(pendientes) >= limite:
+                listos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    yield futuro.result()
+            pendientes.add(pool.submit(resolver_tarea, tarea))
+        for futuro in as_completed(pendientes):
+            yield futuro.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resuelve niveles de Sokoban por lotes.")
+    parser.add_argument("niveles", nargs="+", help="archivos de configuración o colecciones (.xsb, .sok, .txt)")
+    parser.add_argument("--algo", nargs="+", dest="algoritmos", help="algoritmos a correr")
+    parser.add_argument("--heuristicas", nargs="+",
+                        help="combinaciones de heuristicas separadas por coma (ej. matching,manhattan)")
+    parser.add_argument("--expansion", choices=["pasos", "empujes"])
+    parser.add_argument("--backend", choices=["tuplas", "bitboard"])
+    parser.add_argument("--jobs", type=int, default=None, help="procesos en paralelo")
+    parser.add_argument("--timeout", type=float, default=None, help="segundos maximos por tarea")
+    parser.add_argument("--cache", help="archivo de la cache de soluciones")
+    args = parser.parse_args(argv)
+
+    heuristicas = [h.split(",") for h in args.heuristicas] if args.heuristicas else None
+    tareas = generar_tareas(
+        args.niveles, args.algoritmos, heuristicas, args.expansion, args.backend, args.timeout, args.cache
+    )
+    for resultado in resolver_lote(tareas, args.jobs):
+        print(json.dumps(resultado), flush=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import multiprocessing
+import queue
+import types
+
+
+def copiar_config(config, cambios=None):
+    """Copia serializable de la configuración para pasarla a otro proceso.
+    Se descartan los modulos y funciones y se apaga `verbose`.
+
+    Args:
+        config (module): configuración de la busqueda
+        cambios (dict): campos a reemplazar (algoritmo, heuristicas, ...)
+
+    Returns:
+        SimpleNamespace: configuración copiada
+    """
+    campos = {
+        nombre: valor for nombre, valor in vars(config).items()
+        if not nombre.startswith("__") and not isinstance(valor, types.ModuleType) and not callable(valor)
+    }
+    campos.update(cambios or {})
+    campos["verbose"] = False
+    return types.SimpleNamespace(**campos)
+
+
+def _correr(root, config, cola):
+    """Proceso del trabajador: envia por la cola los eventos de la busqueda
+    sin los estados, que no hace falta serializar."""
+    from .tree import recorre_arbol_iter
+
+    for evento in recorre_arbol_iter(root, config):
+        if evento["tipo"] == "fin":
+            resultados = {
+                clave: valor for clave, valor in evento["resultados"].items()
+                if clave not in ("solucion", "estados_explorados", "perfil")
+            }
+            resultados["resuelto"] = evento["resultados"]["solucion"].is_finished()
+            cola.put({"tipo": "fin", "resultados": resultados})
+        else:
+            cola.put({clave: valor for clave, valor in evento.items() if clave != "estado"})
+
+
+class Trabajador:
+    """
+    Corre una busqueda en otro proceso, para no bloquear a quien la lanza (por
+    ejemplo la interfaz grafica). Los eventos de `recorre_arbol_iter` se
+    consultan sin esperar con `eventos()` y la busqueda se puede cancelar en
+    cualquier momento.
+    """
+
+    def __init__(self, root, config, cambios=None):
+        """
+        Args:
+            root (Sokoban): estado inicial del juego
+            config (module): configuración de la busqueda
+            cambios (dict): campos de la configuración a reemplazar
+        """
+        self.config = copiar_config(config, cambios)
+        self.cola = multiprocessing.Queue()
+        self.proceso = multiprocessing.Process(
+            target=_correr, args=(root.as_root(), self.config, self.cola), daemon=True
+        )
+        self.resultados = None
+        self.cancelado = False
+
+    def start(self):
+        self.proceso.start()
+
+    def eventos(self) -> list:
+        """Devuelve los eventos recibidos desde la ultima consulta, sin
+        bloquear. Al recibir el evento "fin" guarda sus resultados.
+
+        Returns:
+            list: eventos de la busqueda
+        """
+        eventos = []
+        while True:
+            try:
+                evento = self.cola.get_nowait()
+            except queue.Empty:
+                break
+            if evento["tipo"] == "fin":
+                self.resultados = evento["resultados"]
+            eventos.append(evento)
+        return eventos
+
+    @property
+    def activo(self) -> bool:
+        """Indica si la busqueda sigue corriendo."""
+        # un proceso terminado puede haber dejado el evento "fin" en la cola
+        if self.cancelado or self.resultados is not None:
+            return False
+        return self.proceso.is_alive() or not self.cola.empty()
+
+    def cancelar(self):
+        """Termina el proceso de la busqueda."""
+        self.cancelado = True
+        if self.proceso.is_alive():
+            self.proceso.terminate()
+        self.proceso.join()
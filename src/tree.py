@@ -1,7 +1,33 @@
 import time
 
-def equal_nodes(state_1, state_2):
-    return (state_1.grid == state_2.grid).all()
+from .anytime import recorre_anytime
+from .bidireccional import bidireccional
+from .bitboard import SokobanBitboard
+from .cache import abrir_cache
+from .frontera import crear_frontera
+from .ida_star import ida_star
+from .instrumentacion import Estadisticas, Presupuesto, perfilar
+from .portfolio import portfolio
+from .sokoban import Sokoban, crear_verificador, resolver_heuristica
+
+
+# Representaciones del estado disponibles para la busqueda
+BACKENDS = {
+    "tuplas": Sokoban,
+    "bitboard": SokobanBitboard,
+}
+
+# Algoritmos que no se resuelven con una frontera y tienen su propio recorrido
+BUSQUEDAS = {
+    "ida_star": ida_star,
+    "bidireccional": bidireccional,
+    "portfolio": portfolio,
+}
+
+# Algoritmos que encadenan recorridos con frontera y emiten sus mismos eventos
+RECORRIDOS = {
+    "anytime_a_star": recorre_anytime,
+}
 
 
 def recorre_arbol(root, config):
@@ -10,77 +36,280 @@ def recorre_arbol(root, config):
 
     Solo devuelve una solución posible. No la óptima.
 
+    Para llegar rapido a una solucion no optima estan "beam" (con
+    `config.beam_width` estados por nivel), "weighted_a_star" (f = g + w * h
+    con `config.weight`) y "anytime_a_star", que repite A* ponderado bajando
+    el peso de a `config.weight_step` y se queda con la mejor solucion.
+
+    Con `config.expansion = "empujes"` cada nodo se expande en los empujes de
+    cajas posibles en lugar de en pasos individuales del jugador.
+
+    Con `config.backend` se elige la representacion del estado usada durante
+    la busqueda ("tuplas" o "bitboard").
+
+    Los estados se identifican por su clave de Zobrist. Con
+    `config.verificar_colisiones` se comprueba ademas que no haya dos estados
+    distintos con la misma clave (modo de depuracion, mas lento).
+
+    Los nodos explorados no se guardan, solo se cuentan. Si se necesitan
+    (por ejemplo para graficar el arbol) se puede activar
+    `config.guardar_explorados`.
+
+    Los resultados incluyen contadores de la busqueda (nodos generados,
+    podados por deadlock o por duplicados, tamaño maximo de la frontera).
+    Con `config.instrumentar` se agregan los tiempos por fase, con
+    `config.observador` se llama a esa funcion cada `config.observador_cada`
+    nodos explorados y con `config.perfilar` se corre la busqueda bajo
+    cProfile y se devuelve el perfil en "perfil".
+
+    La busqueda se puede acotar con `config.max_nodes` (nodos explorados),
+    `config.max_seconds` y `config.max_memory_mb`. Si se excede alguno, la
+    busqueda se corta y devuelve como "solucion" el estado explorado con
+    menor heuristica, con el nombre del limite en "presupuesto_excedido"
+    (None si no se excedio). Todos los algoritmos respetan estos limites.
+
+    Con `config.cache` (una ruta o True) se consulta primero la cache
+    persistente de soluciones y se guarda en ella la solucion encontrada.
+
+    Con `config.verbose` se imprime el progreso cada `config.observador_cada`
+    nodos y cada vez que mejora la heuristica del mejor nodo explorado. Para
+    recibir esos eventos sin imprimirlos se puede usar `recorre_arbol_iter`.
+
     Args:
         root (Sokoban): estado inicial del juego.
 
     Returns:
-        Sokoban: estado final del juego.
+        dict: resultados de la busqueda (tiempo, cantidad de nodos explorados,
+        profundidad maxima, estado final y movimientos).
+    """
+    root = _preparar_root(root, config)
+    cache = abrir_cache(config)
+    if cache is None:
+        return _resolver_perfilado(root, config)
+
+    try:
+        results = cache.buscar(root, config)
+        if results is None:
+            results = _resolver_perfilado(root, config)
+            cache.guardar(root, config, results)
+    finally:
+        cache.close()
+    return results
+
+
+def recorre_arbol_iter(root, config):
+    """Version iterable de `recorre_arbol`: en lugar de bloquear hasta el
+    final, emite eventos a medida que avanza la busqueda. Quien la consume
+    puede mostrar el progreso, aplicar sus propios limites o dejar de iterar
+    para cortar la busqueda.
+
+    Eventos (diccionarios con la clave "tipo"):
+        - "progreso": cada `config.observador_cada` nodos explorados, con las
+          estadisticas de la busqueda y el mejor h alcanzado.
+        - "mejor_h": al explorar un nodo con una heuristica menor a la de
+          todos los anteriores, con "h", "estado" y "nodos_explorados".
+        - "mejora": en anytime_a_star, al encontrar una solucion mas corta,
+          con "weight", "costo", "nodos_explorados" y "tiempo".
+        - "fin": al terminar, con los resultados de `recorre_arbol` en
+          "resultados".
+
+    Los algoritmos de `BUSQUEDAS` (ida_star, bidireccional, portfolio) tienen
+    su propio recorrido y solo emiten el evento "fin".
+
+    Args:
+        root (Sokoban): estado inicial del juego.
+        config (module): configuración de la busqueda.
+
+    Yields:
+        dict: eventos de la busqueda
+    """
+    root = _preparar_root(root, config)
+    if config.algoritmo in BUSQUEDAS:
+        yield {"tipo": "fin", "resultados": BUSQUEDAS[config.algoritmo](root, config)}
+        return
+    yield from RECORRIDOS.get(config.algoritmo, _recorre_frontera)(root, config)
+
+
+def _preparar_root(root, config):
+    """Convierte el estado inicial al backend de la configuración."""
+    backend = getattr(config, "backend", "tuplas")
+    if backend not in BACKENDS:
+        raise ValueError("Backend Invalido")
+    return root.as_root(BACKENDS[backend])
+
+
+def _resolver_perfilado(root, config):
+    """Corre `_resolver`, bajo cProfile si `config.perfilar`."""
+    if getattr(config, "perfilar", False):
+        results, perfil = perfilar(_resolver, root, config)
+        results["perfil"] = perfil
+        return results
+    return _resolver(root, config)
+
+
+def _resolver(root, config):
+    """Corre la busqueda hasta el final imprimiendo los eventos si
+    `config.verbose` y devuelve los resultados."""
+    if config.algoritmo in BUSQUEDAS:
+        return BUSQUEDAS[config.algoritmo](root, config)
+
+    for evento in RECORRIDOS.get(config.algoritmo, _recorre_frontera)(root, config):
+        if not config.verbose:
+            continue
+        if evento["tipo"] == "progreso":
+            print("Nodos {}\tFrontera {}\tMejor h {}\t{:.1f} nodos/s".format(
+                evento["nodos_explorados"], evento["frontera_actual"], evento["mejor_h"],
+                evento["nodos_explorados"] / max(evento["tiempo"], 1e-9),
+            ))
+        elif evento["tipo"] == "mejor_h":
+            print("Nodo {}\tMejor h {}\tMov. {}".format(
+                evento["nodos_explorados"], evento["h"], evento["estado"].g
+            ))
+        elif evento["tipo"] == "mejora":
+            print("Peso {}\tSolucion de costo {}\tNodos {}".format(
+                evento["weight"], evento["costo"], evento["nodos_explorados"]
+            ))
+        elif evento["resultados"]["solucion"].is_finished():
+            print("Solucion Encontrada")
+    return evento["resultados"]
+
+
+def _recorre_frontera(root, config, frontera=None, estadisticas=None, presupuesto=None, cota=None):
+    """Recorrido con una frontera de `FRONTERAS` (bfs, dfs, greedy, a_star,
+    weighted_a_star, beam).
+
+    Los recorridos encadenados (ver `RECORRIDOS`) pasan su propia frontera y
+    comparten las estadisticas y el presupuesto entre recorridos.
+
+    Args:
+        root (Sokoban): estado inicial del juego.
+        config (module): configuración de la busqueda.
+        frontera (Frontera): frontera a usar, None para la del algoritmo
+        estadisticas (Estadisticas): contadores a acumular, None para nuevos
+        presupuesto (Presupuesto): limites ya iniciados, None para nuevos
+        cota (int): se podan los estados con g + h mayor o igual, None sin cota
+
+    Yields:
+        dict: eventos de la busqueda (ver `recorre_arbol_iter`); el ultimo
+        tiene los resultados, con las estadisticas por fase.
     """
 
     # Estadisticas del algoritmo
     t_inicial = time.time()
     max_nivel_alcanzado = 0
-    
-    # inicio del algoritmo
-    root.movements = ""
-    frontera = [root]
-    nodos_explorados = []
-    while frontera:
+    if estadisticas is None:
+        estadisticas = Estadisticas.desde_config(config)
 
-        # Elige el nodo a visitar
-        if config.algoritmo == "bfs":
-            current = frontera.pop(0)
+    # inicio del algoritmo
+    guardar_explorados = getattr(config, "guardar_explorados", False)
+    por_empujes = getattr(config, "expansion", "pasos") == "empujes"
+    verificar = crear_verificador(config, por_empujes)
+    root = root.as_root()
+    if frontera is None:
+        frontera = crear_frontera(config)
+    heuristica = resolver_heuristica(getattr(config, "heuristicas", ["manhattan"]))
+    mejor_h = float("inf")
+    mejor_estado = root
+    if presupuesto is None:
+        presupuesto = Presupuesto(config)
+    excedido = None
+    estados_explorados = []
+    # claves de los estados ya generados (explorados o en la frontera)
+    visitados = {root.get_key(por_empujes)}
+    # menor costo conocido para llegar a cada estado (A*). Usa la casilla
+    # exacta del jugador: con la region normalizada se descartaria un estado
+    # mas caro hasta ahora pero con menos caminata restante
+    mejor_costo = {root.get_key(): 0}
 
-        elif config.algoritmo == "dfs":
-            current = frontera.pop()
+    def es_duplicado(state):
+        """Indica si el estado ya se alcanzo (en A*, con un costo menor o
+        igual). Si no, lo registra como visitado."""
+        if verificar: verificar(state)
+        if frontera.usa_costo:
+            # se reinserta el estado si se llega con un costo menor
+            key = state.get_key()
+            costo = state.get_actual_cost()
+            if costo >= mejor_costo.get(key, float("inf")): return True
+            mejor_costo[key] = costo
+            return False
+        key = state.get_key(por_empujes)
+        if key in visitados: return True
+        visitados.add(key)
+        return False
 
-        elif config.algoritmo == "greedy":
-            frontera.sort(key= lambda s: s.get_heuristic(config.heuristicas))
-            current = frontera.pop(0)  # Visita el nodo con menor heuristica
+    # funciones de cada fase, cronometradas solo si se pide instrumentacion
+    if hasattr(frontera, "clave"):
+        frontera.clave = estadisticas.cronometro("heuristica", frontera.clave)
+    push = estadisticas.cronometro("frontera", frontera.push)
+    pop = estadisticas.cronometro("frontera", frontera.pop)
+    expandir = estadisticas.cronometro("expansion", lambda s: s.get_successors(por_empujes))
+    es_deadlock = estadisticas.cronometro("deadlock", lambda s: s.is_deadlocked(incremental=True))
+    es_duplicado = estadisticas.cronometro("duplicados", es_duplicado)
 
-        elif config.algoritmo == "a_star":
-            frontera.sort(key= lambda s: (
-                s.get_actual_cost() + s.get_heuristic(config.heuristicas), # 1 nivel de ordenamiento
-                s.get_heuristic(config.heuristicas),                       # 2 nivel de ordenamiento
-            ))
-            current = frontera.pop(0)  # Visita el nodo con menor costo
+    push(root)
+    while frontera:
 
-        else:
-            raise ValueError("Algoritmo Invalido")
+        # Elige el nodo a visitar segun la estrategia de la frontera
+        current = pop()
 
+        # Borrado perezoso: la entrada quedo obsoleta porque luego se
+        # encontro un camino mas barato al mismo estado
+        if frontera.usa_costo and current.get_actual_cost() > mejor_costo[current.get_key()]:
+            continue
 
-        if config.verbose: print("Nodo {}".format(len(nodos_explorados)), end="\t")
-        if config.verbose: print("Mov. {}".format(len(current.movements)), end="\t")
-        if config.verbose: print(current.movements)
-        
-        
         if current.is_finished():
-            if config.verbose: print("Solucion Encontrada")
+            break
+
+        excedido = presupuesto.excedido(estadisticas.explorados)
+        if excedido:
+            if config.verbose: print("Presupuesto excedido: {}".format(excedido))
             break
 
         # inserta el nodo en los nodos ya visitados
-        nodos_explorados.append(current)
-        max_nivel_alcanzado = max(max_nivel_alcanzado, len(current.movements))
+        if estadisticas.nodo_explorado(len(frontera)):
+            yield {"tipo": "progreso", "mejor_h": mejor_h, **estadisticas.as_dict()}
+        h = heuristica(current)
+        if h < mejor_h:
+            mejor_h = h
+            mejor_estado = current
+            yield {"tipo": "mejor_h", "h": h, "estado": current, "nodos_explorados": estadisticas.explorados}
+        if guardar_explorados: estados_explorados.append(current)
+        max_nivel_alcanzado = max(max_nivel_alcanzado, current.g)
 
         
         # expande el nodo y suma a la lista los estados no prohibidos
-        for move in current.get_possible_moves():
-            new_state = move()
-
-            if not new_state: continue
-            if new_state.is_deadlocked(): continue
-            was_visited = any([equal_nodes(new_state, prev_state) for prev_state in nodos_explorados])
-            if was_visited: continue
-            
-            frontera.append(new_state)
+        sucesores = expandir(current)
+        estadisticas.generados += len(sucesores)
+        for new_state in sucesores:
+
+            if es_deadlock(new_state):
+                estadisticas.podados_deadlock += 1
+                continue
+            # con una cota solo interesan las soluciones mas cortas
+            if cota is not None and new_state.g + heuristica(new_state) >= cota:
+                continue
+            if es_duplicado(new_state):
+                estadisticas.podados_duplicados += 1
+                continue
+
+            push(new_state)
                 
     t_final = time.time()
 
+    # si se corto por presupuesto se devuelve el estado mas prometedor
+    if excedido: current = mejor_estado
     results = {
         "tiempo": t_final - t_inicial,
-        "nodos_explorados": nodos_explorados,        
+        "nodos_explorados": estadisticas.explorados,
+        "nodos_generados": estadisticas.generados,
+        "profundidad_maxima": max_nivel_alcanzado,
         "solucion": current,
-        "movimientos": current.movements
+        "movimientos": current.movements,
+        "estadisticas": estadisticas.as_dict(),
+        "presupuesto_excedido": excedido,
+        "mejor_h": mejor_h,
     }
+    if guardar_explorados:
+        results["estados_explorados"] = estados_explorados
 
-    return results
+    yield {"tipo": "fin", "resultados": results}
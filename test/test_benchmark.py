@@ -0,0 +1,23 @@
+import copy
+
+from src.benchmark import comparar, correr_benchmark
+
+
+def test_benchmark_y_comparacion():
+    base = correr_benchmark(
+        ["config/01_basico.py"], ["bfs", "a_star"], [["manhattan"], ["matching"]], ["pasos"], timeout=10
+    )
+    # bfs no depende de la heuristica: se corre una sola vez
+    assert len(base["resultados"]) == 3
+    for r in base["resultados"]:
+        assert r["estado"] == "resuelto"
+        assert r["nodos_generados"] >= r["nodos_explorados"] > 0
+        assert r["nodos_por_segundo"] > 0
+        assert r["longitud"] == len(r["movimientos"])
+    assert comparar(base, base) == []
+
+    actual = copy.deepcopy(base)
+    actual["resultados"][0]["nodos_explorados"] += 1
+    actual["resultados"][1]["estado"] = "tiempo_agotado"
+    actual["resultados"][2]["tiempo"] += 1
+    assert len(comparar(base, actual)) == 3
@@ -0,0 +1,98 @@
+from src.cache import CacheSoluciones, hash_nivel
+from src.sokoban import Sokoban
+from src.tree import recorre_arbol
+
+
+class Config:
+    pass
+
+basic_grid_with_objective = """
+#######
+#@$  .#
+#   $ #
+#   . #
+#     #
+#######
+"""
+def _config(ruta):
+    config = Config()
+    config.algoritmo = "bfs"
+    config.verbose = False
+    config.heuristicas = ["manhattan"]
+    config.cache = ruta
+    return config
+
+def test_cache_reutiliza_solucion(tmp_path):
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+    config = _config(str(tmp_path / "cache.sqlite"))
+
+    results = recorre_arbol(s_init, config)
+    assert "cache" not in results
+    results = recorre_arbol(s_init, config)
+    assert results["cache"]
+    assert results["movimientos"] == "rrrd"
+    assert results["solucion"].is_finished()
+
+    # otros ajustes son otra entrada
+    config.algoritmo = "dfs"
+    assert "cache" not in recorre_arbol(s_init, config)
+
+def test_hash_canonico():
+    a = Sokoban()
+    a.parse_grid(basic_grid_with_objective)
+    b = Sokoban()
+    b.parse_grid(basic_grid_with_objective.replace("#\n", "#   \n") + "\n\n")
+    assert hash_nivel(a) == hash_nivel(b)
+    assert hash_nivel(a) != hash_nivel(a.move_right())
+
+def test_validacion_e_invalidacion(tmp_path):
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+    config = _config(str(tmp_path / "cache.sqlite"))
+    recorre_arbol(s_init, config)
+
+    cache = CacheSoluciones(config.cache)
+    cache.conexion.execute("UPDATE soluciones SET movimientos = 'rr'")
+    # una solucion que no resuelve el nivel se descarta
+    assert cache.buscar(s_init, config) is None
+    assert cache.info()["entradas"] == 0
+
+    recorre_arbol(s_init, config)
+    assert cache.invalidar(s_init) == 1
+    cache.close()
+
+def test_desalojo(tmp_path):
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+    cache = CacheSoluciones(str(tmp_path / "cache.sqlite"), max_mb=0)
+    config = _config(None)
+    cache.guardar(s_init, config, recorre_arbol(s_init, config))
+    assert cache.info()["entradas"] == 0
+    cache.close()
+
+def test_cache_mantiene_resultados(tmp_path):
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+    config = _config(str(tmp_path / "cache.sqlite"))
+    config.algoritmo = "a_star"
+
+    calculado = recorre_arbol(s_init, config)
+    guardado = recorre_arbol(s_init, config)
+    assert guardado["cache"]
+    for campo in ("estadisticas", "presupuesto_excedido", "mejor_h"):
+        assert guardado[campo] == calculado[campo]
+
+    # los ajustes que cambian la solucion elegida son parte de la clave
+    config.portfolio_deadline = 5
+    assert "cache" not in recorre_arbol(s_init, config)
+
+    # los estados explorados no se guardan: no se usa la cache
+    config.guardar_explorados = True
+    results = recorre_arbol(s_init, config)
+    assert "cache" not in results and results["estados_explorados"]
+
+def test_hash_sin_paredes():
+    s = Sokoban()
+    s.parse_grid("\n@$.\n")
+    assert hash_nivel(s) != hash_nivel(s.move_right())
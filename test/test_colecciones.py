@@ -0,0 +1,88 @@
+import json
+import os
+import pickle
+
+from src.colecciones import cargar_coleccion, leer_mapas, leer_tablas
+from src.sokoban import Sokoban
+from src.solve import generar_tareas, resolver_tarea
+
+
+coleccion = """; 1
+
+#######
+#@$  .#
+#######
+
+Segundo nivel
+#######
+#@ $ .#
+#######
+Author: alguien
+
+#####
+#@$.#
+#####
+Title: Tercero
+"""
+
+
+def test_leer_mapas_titulos():
+    mapas = list(leer_mapas(coleccion.splitlines(True)))
+    assert [titulo for titulo, _ in mapas] == ["1", "Segundo nivel", "Tercero"]
+    assert mapas[2][1] == "\n#####\n#@$.#\n#####\n"
+
+
+def test_cargar_coleccion_con_tablas(tmp_path):
+    ruta = str(tmp_path / "niveles.xsb")
+    with open(ruta, "w") as f:
+        f.write(coleccion)
+
+    assert len(list(cargar_coleccion(ruta))) == 3
+    assert os.path.exists(ruta + ".tablas")
+    recargados = list(cargar_coleccion(ruta))
+    assert [titulo for titulo, _ in recargados] == ["1", "Segundo nivel", "Tercero"]
+
+    mapas = [mapa for _, mapa in leer_mapas(coleccion.splitlines(True))]
+    for mapa, (_, cargado) in zip(mapas, recargados):
+        calculado = Sokoban()
+        calculado.parse_grid(mapa)
+        for tabla in ("casillas_muertas", "distancia_manhattan_goal", "costos_empuje", "zobrist_cajas"):
+            assert getattr(cargado.nivel, tabla) == getattr(calculado.nivel, tabla)
+        assert cargado.get_key() == calculado.get_key()
+        assert cargado.nivel._tablas
+
+
+def test_tablas_ajenas_se_ignoran(tmp_path):
+    ruta = str(tmp_path / "niveles.xsb")
+    with open(ruta, "w") as f:
+        f.write(coleccion)
+    list(cargar_coleccion(ruta))
+    assert len(leer_tablas(ruta + ".tablas")) == 3
+
+    # un archivo de otra version se descarta y se vuelve a escribir
+    with open(ruta + ".tablas", "rb") as f:
+        cabecera, indice, datos = f.readline(), json.loads(f.readline()), f.read()
+    indice["version"] = -1
+    with open(ruta + ".tablas", "wb") as f:
+        f.write(cabecera + json.dumps(indice).encode() + b"\n" + datos)
+    assert leer_tablas(ruta + ".tablas") == {}
+    list(cargar_coleccion(ruta))
+    assert len(leer_tablas(ruta + ".tablas")) == 3
+
+    # un pickle no se ejecuta
+    with open(ruta + ".tablas", "wb") as f:
+        pickle.dump({"tablas": os.getcwd}, f)
+    assert leer_tablas(ruta + ".tablas") == {}
+
+
+def test_solve_coleccion(tmp_path):
+    ruta = str(tmp_path / "niveles.sok")
+    with open(ruta, "w") as f:
+        f.write(coleccion)
+
+    tareas = list(generar_tareas([ruta], ["bfs"]))
+    assert [tarea["nivel"] for tarea in tareas] == [ruta + ": " + t for t in ("1", "Segundo nivel", "Tercero")]
+    resultados = [resolver_tarea(tarea) for tarea in tareas]
+    assert all(r["estado"] == "resuelto" for r in resultados)
+    # las tablas faltantes se calculan en cada tarea, sin escribir la cache
+    assert not os.path.exists(ruta + ".tablas")
@@ -0,0 +1,60 @@
+import pytest
+
+from src.frontera import Frontera, FronteraFIFO, FronteraHaz, FronteraLIFO, FronteraPrioridad, crear_frontera
+
+
+class Config:
+    pass
+
+
+def test_fifo():
+    frontera = FronteraFIFO()
+    for x in [1, 2, 3]:
+        frontera.push(x)
+    assert [frontera.pop() for _ in range(3)] == [1, 2, 3]
+    assert not frontera
+
+
+def test_lifo():
+    frontera = FronteraLIFO()
+    for x in [1, 2, 3]:
+        frontera.push(x)
+    assert [frontera.pop() for _ in range(3)] == [3, 2, 1]
+
+
+def test_prioridad_fifo_en_empates():
+    frontera = FronteraPrioridad(lambda x: (x % 2,))
+    for x in [1, 2, 3, 4]:
+        frontera.push(x)
+    assert [frontera.pop() for _ in range(4)] == [2, 4, 1, 3]
+
+
+def test_haz_conserva_los_mejores_por_nivel():
+    frontera = FronteraHaz(lambda x: x, 2)
+    for x in [5, 1, 3]:
+        frontera.push(x)
+    assert frontera.pop() == 1
+    frontera.push(0)
+    assert frontera.pop() == 3
+    # el nivel siguiente solo empieza al agotar el actual
+    assert frontera.pop() == 0
+    assert not frontera
+
+
+def test_algoritmo_invalido():
+    config = Config()
+    config.algoritmo = "no_existe"
+    with pytest.raises(ValueError):
+        crear_frontera(config)
+
+
+def test_frontera_incompleta():
+    class SinPop(Frontera):
+        def push(self, state):
+            pass
+
+        def __len__(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        SinPop()
@@ -1,5 +1,12 @@
 
-from src.sokoban import Sokoban
+import random
+import types
+
+import pytest
+
+from src.matching import INFINITO, asignacion_greedy, costo_asignacion, hungaro
+from src.sokoban import Sokoban, resolver_heuristica
+from src.tree import recorre_arbol
 
 
 basic_grid = """
@@ -20,3 +27,128 @@ def test_distancia_a_caja():
     s = Sokoban()
     s.parse_grid(basic_grid)
     assert s.get_heuristic(["distancia_a_caja"]) == 2
+
+
+grid_with_box_in_goal = """
+#######
+#@  * #
+# . $ #
+#     #
+#######
+"""
+
+def test_distancia_a_caja_ignora_cajas_en_goal():
+    s = Sokoban()
+    s.parse_grid(grid_with_box_in_goal)
+    assert s.get_heuristic(["distancia_a_caja"]) == 4
+
+
+def test_combinacion_y_cache():
+    s = Sokoban()
+    s.parse_grid(basic_grid)
+    heuristica = resolver_heuristica(["manhattan", "distancia_a_caja"])
+    assert heuristica is resolver_heuristica(["manhattan", "distancia_a_caja"])
+    assert heuristica(s) == 2
+    assert s.get_heuristic([]) == 0
+
+
+def test_heuristica_invalida():
+    with pytest.raises(ValueError):
+        resolver_heuristica(["no_existe"])
+
+
+grid_with_wall_between = """
+#########
+#       #
+#   $   #
+#  ###  #
+#   .   #
+# @     #
+#########
+"""
+
+def test_matching_respeta_paredes():
+    s = Sokoban()
+    s.parse_grid(grid_with_wall_between)
+    # la caja tiene que rodear la pared
+    assert s.get_heuristic(["manhattan"]) == 2
+    assert s.get_heuristic(["matching"]) == 6
+
+
+basic_grid_with_objective = """
+#######
+#@$  .#
+#   $ #
+#   . #
+#     #
+#######
+"""
+
+def test_matching_incremental():
+    s = Sokoban()
+    s.parse_grid(basic_grid_with_objective)
+    s.heuristica_matching()
+    for letra in "rrrd":
+        s = getattr(s, {"r": "move_right", "d": "move_down"}[letra])()
+        valor = s.heuristica_matching()
+        # misma heuristica resolviendo la asignacion de cero
+        fresco = s.as_root()
+        assert valor == fresco.heuristica_matching()
+    assert valor == 0
+
+
+def test_hungaro():
+    costos = [[4, 1, 3], [2, 0, 5], [3, 2, 2]]
+    _, _, p = hungaro(costos)
+    assert costo_asignacion(costos, p) == 5
+    assert asignacion_greedy(costos) == 6
+
+
+# 2 cajas y 4 goals
+grid_mas_goals = """
+#########
+# .  # ##
+##  $ # #
+#  @$  .#
+# . .# ##
+#########
+"""
+
+def test_matching_mas_goals_que_cajas():
+    costos = [[8, 5, 6, 0, 6], [1, 1, 1, 1, 3]]
+    _, _, p = hungaro(costos)
+    assert costo_asignacion(costos, p) == 1
+
+    s_init = Sokoban()
+    s_init.parse_grid(grid_mas_goals)
+    s_init.heuristica_matching()
+    generador = random.Random(0)
+    for _ in range(50):
+        s = s_init
+        for _ in range(6):
+            sucesores = s.get_successors(True)
+            if not sucesores:
+                break
+            s = generador.choice(sucesores)
+            assert s.heuristica_matching() == s.as_root().heuristica_matching()
+
+    # con la heuristica admisible A* encuentra la solucion mas corta
+    largos = []
+    for algoritmo in ["bfs", "a_star"]:
+        config = types.SimpleNamespace(algoritmo=algoritmo, verbose=False, heuristicas=["matching"])
+        largos.append(len(recorre_arbol(s_init, config)["movimientos"]))
+    assert largos == [9, 9]
+
+
+def test_matching_mas_cajas_que_goals():
+    with pytest.raises(ValueError):
+        hungaro([[1], [2]])
+
+    s = Sokoban()
+    s.parse_grid("""
+#######
+#@$ $ #
+#   . #
+#######
+""")
+    assert s.get_heuristic(["matching"]) == INFINITO
@@ -123,4 +123,122 @@ def test_box_started_in_goal():
    s.parse_grid(grid_with_player_in_goal)
    assert len(s.boxes) == 0
    assert len(s.goals) == 1
-   
\ No newline at end of file
+   
+
+def test_get_key():
+   s = Sokoban()
+   s.parse_grid(basic_grid_with_boxes)
+   assert hash(s.get_key()) == hash(s.get_key())
+   # volver a la misma posicion genera la misma clave
+   other = s.move_down().move_up()
+   assert other.get_key() == s.get_key()
+   assert other == s
+   assert s.move_right().get_key() != s.get_key()
+
+
+def test_level_is_shared():
+   s = Sokoban()
+   s.parse_grid(basic_grid_with_boxes)
+   other = s.move_right()
+   assert other.nivel is s.nivel
+   assert not hasattr(other, "__dict__")
+   assert s.boxes == [(2, 2), (3, 2)]
+
+
+def test_possible_pushes():
+   s = Sokoban()
+   s.parse_grid(basic_grid_with_objective)
+   pushes = s.get_possible_pushes()
+   # la caja junto a la pared solo puede empujarse en horizontal
+   assert len(pushes) == 6
+   assert all(p.g == len(p.movements) for p in pushes)
+   # los estados que solo difieren en la posicion del jugador comparten clave
+   assert s.get_key(True) == s.move_down().get_key(True)
+   assert s.get_key() != s.move_down().get_key()
+
+
+grid_with_dead_square="""
+########
+#.    ##
+##  #  #
+#   #  #
+#   #$ #
+# #   @#
+########
+"""
+def test_dead_square_not_in_corner():
+   # la caja no esta en una esquina ni contra una pared sin goals, pero
+   # ningun empuje posible la acerca al goal
+   s = Sokoban()
+   s.parse_grid(grid_with_dead_square)
+   assert s.nivel.casillas_muertas[s.nivel.indice(4, 5)]
+   assert not s.nivel.casillas_muertas[s.nivel.indice(2, 3)]
+   assert s.is_deadlocked()
+
+
+grid_with_freeze_deadlock="""
+#######
+#  #  #
+#  $$ #
+#   # #
+# .. @#
+#######
+"""
+def test_freeze_deadlock():
+   # ninguna caja esta en una casilla muerta, pero se bloquean entre si
+   s = Sokoban()
+   s.parse_grid(grid_with_freeze_deadlock)
+   assert not any(s.nivel.casillas_muertas[b] for b in s._boxes)
+   assert not s._is_block_deadlock(s.nivel.indice(3, 3))
+   assert s.is_deadlocked()
+   # el estado inicial no viene de un empuje
+   assert not s.is_deadlocked(incremental=True)
+
+
+grid_before_block_deadlock="""
+#######
+#     #
+# $$  #
+#  $ .#
+# $ ..#
+# @  .#
+#######
+"""
+def test_block_deadlock():
+   s = Sokoban()
+   s.parse_grid(grid_before_block_deadlock)
+   assert not s.is_deadlocked()
+   # empujar la caja hacia arriba forma un bloque de 2x2 de cajas
+   s = s.move_up()
+   assert s.boxes == [(3, 2), (3, 3), (4, 2), (4, 3)]
+   assert s._is_block_deadlock(s.nivel.indice(4, 2))
+   assert s.is_deadlocked(incremental=True)
+
+
+def test_zobrist_incremental():
+   s = Sokoban()
+   s.parse_grid(basic_grid_with_objective)
+   for move in ["move_right", "move_right", "move_right", "move_down"]:
+      s = getattr(s, move)()
+      # el hash actualizado con XOR coincide con el calculado de cero
+      assert s._hash_cajas == s.nivel.hash_cajas(s._boxes)
+      assert s.get_key() == s.as_root().get_key()
+   for push in s.get_possible_pushes():
+      assert push._hash_cajas == s.nivel.hash_cajas(push._boxes)
+   assert isinstance(s.get_key(True), int)
+   assert s.get_full_key() == (s._player, s._boxes)
+
+
+def test_bitboard_backend():
+   from src.bitboard import SokobanBitboard
+   s = Sokoban()
+   s.parse_grid(grid_before_block_deadlock)
+   b = SokobanBitboard()
+   b.parse_grid(grid_before_block_deadlock)
+   assert b.boxes == s.boxes
+   assert b.get_key() == s.get_key() and b.get_key(True) == s.get_key(True)
+   assert [p.movements for p in b.get_possible_pushes()] == [p.movements for p in s.get_possible_pushes()]
+   # el mismo bloque de 2x2 se detecta con mascaras
+   assert b.move_up()._is_block_deadlock(b.nivel.indice(4, 2))
+   assert s.as_root(SokobanBitboard).get_full_key() == b.get_full_key()
+   assert b.move_up().get_key() == s.move_up().get_key()
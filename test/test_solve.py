@@ -0,0 +1,27 @@
+import json
+
+from src.solve import generar_tareas, main, resolver_tarea
+
+
+def test_generar_tareas():
+    tareas = list(generar_tareas(["a.py", "b.py"], ["bfs", "a_star"], [["manhattan"], ["matching"]]))
+    assert len(tareas) == 8
+    # sin algoritmos ni heuristicas se usan los del archivo
+    assert next(generar_tareas(["a.py"]))["algoritmo"] is None
+
+def test_resolver_tarea():
+    tarea = next(generar_tareas(["config/01_basico.py"], ["bfs"]))
+    resultado = resolver_tarea(tarea)
+    assert resultado["estado"] == "resuelto"
+    assert resultado["movimientos"] == "rrrd"
+    assert resultado["heuristicas"] == ["manhattan"]
+
+def test_tiempo_agotado():
+    tarea = next(generar_tareas(["config/03_dificil.py"], ["bfs"], timeout=0.05))
+    assert resolver_tarea(tarea)["estado"] == "tiempo_agotado"
+
+def test_main(capsys):
+    main(["config/01_basico.py", "config/02_medio.py", "--algo", "bfs", "a_star", "--jobs", "2"])
+    lineas = [json.loads(l) for l in capsys.readouterr().out.splitlines()]
+    assert len(lineas) == 4
+    assert all(l["estado"] == "resuelto" for l in lineas)
@@ -1,5 +1,7 @@
+import pytest
+
 from src.sokoban import Sokoban
-from src.tree import recorre_arbol
+from src.tree import recorre_arbol, recorre_arbol_iter
 
 
 class Config:
@@ -62,3 +64,331 @@ def test_a_star():
     s_finished = recorre_arbol(s_init, config)["solucion"]    
     assert s_finished.is_finished()
     assert s_finished.movements == "rrrd"
+
+def test_results_stats():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.verbose = False
+    config.algoritmo = "bfs"
+
+    results = recorre_arbol(s_init, config)
+    assert isinstance(results["nodos_explorados"], int)
+    assert results["profundidad_maxima"] <= len(results["movimientos"])
+    assert results["solucion"].get_actual_cost() == 4
+    assert "estados_explorados" not in results
+
+    config.guardar_explorados = True
+    results = recorre_arbol(s_init, config)
+    assert len(results["estados_explorados"]) == results["nodos_explorados"]
+
+def test_bfs_por_empujes():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.verbose = False
+    config.algoritmo = "bfs"
+    config.expansion = "empujes"
+
+    results = recorre_arbol(s_init, config)
+    assert results["solucion"].is_finished()
+
+    # la secuencia de pasos reconstruida resuelve el juego
+    moves = {"u": "move_up", "d": "move_down", "l": "move_left", "r": "move_right"}
+    s = s_init
+    for m in results["movimientos"]:
+        s = getattr(s, moves[m])()
+    assert s.is_finished()
+
+def test_ida_star():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.algoritmo = "ida_star"
+    config.verbose = False
+    config.heuristicas = ["manhattan"]
+    config.tabla_transposicion = 2
+
+    results = recorre_arbol(s_init, config)
+    assert results["solucion"].is_finished()
+    assert results["movimientos"] == "rrrd"
+    assert results["iteraciones"] == len(results["umbrales"])
+    assert results["umbrales"] == sorted(results["umbrales"])
+
+def test_ida_star_optimo_por_empujes():
+    from src.solve import cargar_config
+
+    s_init = Sokoban()
+    s_init.parse_grid(cargar_config("config/05.py").mapa)
+    largos = []
+    for algoritmo in ["a_star", "ida_star"]:
+        config = Config()
+        config.algoritmo = algoritmo
+        config.verbose = False
+        config.heuristicas = ["matching"]
+        config.expansion = "empujes"
+        largos.append(len(recorre_arbol(s_init, config)["movimientos"]))
+    assert largos == [56, 56]
+
+
+def test_a_star_optimo_por_empujes():
+    # el estado mas caro hasta ahora tiene menos caminata restante
+    grid = """
+#######
+#.  $@#
+# $  .#
+#    ##
+#     #
+#######
+"""
+    s_init = Sokoban()
+    s_init.parse_grid(grid)
+    largos = []
+    for algoritmo, expansion in [("a_star", "pasos"), ("a_star", "empujes"), ("anytime_a_star", "empujes")]:
+        config = Config()
+        config.algoritmo = algoritmo
+        config.verbose = False
+        config.heuristicas = ["matching"]
+        config.expansion = expansion
+        largos.append(len(recorre_arbol(s_init, config)["movimientos"]))
+    assert largos == [12, 12, 12]
+
+
+def test_bidireccional():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.algoritmo = "bidireccional"
+    config.verbose = False
+
+    results = recorre_arbol(s_init, config)
+    assert results["solucion"].is_finished()
+    assert results["nodos_explorados"] == results["nodos_adelante"] + results["nodos_atras"]
+
+    # los movimientos unidos son validos desde el estado inicial
+    moves = {"u": "move_up", "d": "move_down", "l": "move_left", "r": "move_right"}
+    s = s_init
+    for m in results["movimientos"]:
+        s = getattr(s, moves[m])()
+    assert s.is_finished()
+
+def test_verificar_colisiones():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    for algoritmo in ["bfs", "ida_star", "bidireccional"]:
+        config = Config()
+        config.algoritmo = algoritmo
+        config.verbose = False
+        config.heuristicas = ["manhattan"]
+        config.verificar_colisiones = True
+        assert recorre_arbol(s_init, config)["solucion"].is_finished()
+
+    # con una tabla de Zobrist degenerada todos los estados colisionan
+    s_init.nivel.zobrist_cajas = [0] * len(s_init.nivel.zobrist_cajas)
+    s_init.nivel.zobrist_jugador = [0] * len(s_init.nivel.zobrist_jugador)
+    config.algoritmo = "bfs"
+    with pytest.raises(RuntimeError):
+        recorre_arbol(s_init, config)
+
+
+def test_backend_bitboard():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    for algoritmo in ["bfs", "a_star", "ida_star", "bidireccional"]:
+        config = Config()
+        config.algoritmo = algoritmo
+        config.verbose = False
+        config.heuristicas = ["manhattan"]
+        config.backend = "bitboard"
+        s_finished = recorre_arbol(s_init, config)["solucion"]
+        assert s_finished.is_finished()
+        config.backend = "tuplas"
+        assert recorre_arbol(s_init, config)["movimientos"] == s_finished.movements
+
+    config.backend = "listas"
+    with pytest.raises(ValueError):
+        recorre_arbol(s_init, config)
+
+
+def test_suboptimos():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.verbose = False
+    config.heuristicas = ["manhattan"]
+    config.weight = 3
+    config.weight_step = 1
+    config.beam_width = 2
+    for algoritmo in ["weighted_a_star", "anytime_a_star", "beam"]:
+        config.algoritmo = algoritmo
+        results = recorre_arbol(s_init, config)
+        assert results["solucion"].is_finished()
+        assert results["solucion"] == s_init.apply_moves(results["movimientos"])
+        assert results["presupuesto_excedido"] is None
+        assert results["estadisticas"]["nodos_explorados"] == results["nodos_explorados"]
+
+    # anytime termina con peso 1: la ultima mejora es la solucion optima
+    config.algoritmo = "anytime_a_star"
+    results = recorre_arbol(s_init, config)
+    assert results["movimientos"] == "rrrd"
+    costos = [mejora["costo"] for mejora in results["mejoras"]]
+    assert costos == sorted(costos, reverse=True) and costos[-1] == 4
+
+    # las mejoras tambien se emiten como eventos
+    config.guardar_explorados = True
+    eventos = list(recorre_arbol_iter(s_init, config))
+    assert [e["costo"] for e in eventos if e["tipo"] == "mejora"] == costos
+    assert eventos[-1]["resultados"]["estados_explorados"]
+    config.guardar_explorados = False
+
+    # el haz respeta los limites de la busqueda
+    config.algoritmo = "beam"
+    config.beam_width = 1
+    config.max_nodes = 1
+    results = recorre_arbol(s_init, config)
+    assert results["presupuesto_excedido"] == "max_nodes"
+
+
+def test_portfolio():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.algoritmo = "portfolio"
+    config.verbose = False
+    config.portfolio = [{"algoritmo": "dfs"}, {"algoritmo": "bfs"}]
+    # con un limite se espera a ambas y se elige la solucion mas corta
+    config.portfolio_deadline = 10
+    results = recorre_arbol(s_init, config)
+    assert results["solucion"].is_finished()
+    assert results["movimientos"] == "rrrd"
+    assert results["estrategia"] == {"algoritmo": "bfs"}
+    assert [r["estado"] for r in results["estrategias"]] == ["resuelto", "resuelto"]
+
+    config.portfolio = [{"algoritmo": "portfolio"}]
+    with pytest.raises(ValueError):
+        recorre_arbol(s_init, config)
+
+
+def test_instrumentacion():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    avisos = []
+    config = Config()
+    config.algoritmo = "a_star"
+    config.verbose = False
+    config.heuristicas = ["manhattan"]
+    config.instrumentar = True
+    config.observador = avisos.append
+    config.observador_cada = 2
+    results = recorre_arbol(s_init, config)
+    estadisticas = results["estadisticas"]
+    assert estadisticas["nodos_explorados"] == results["nodos_explorados"]
+    assert estadisticas["nodos_generados"] >= estadisticas["podados_deadlock"] + estadisticas["podados_duplicados"]
+    assert estadisticas["frontera_maxima"] > 0
+    assert set(estadisticas["tiempos"]) == {"expansion", "deadlock", "duplicados", "heuristica", "frontera"}
+    assert len(avisos) == results["nodos_explorados"] // 2
+
+    config.instrumentar = False
+    config.observador = None
+    config.perfilar = True
+    results = recorre_arbol(s_init, config)
+    assert "tiempos" not in results["estadisticas"]
+    assert results["perfil"].total_calls > 0
+
+
+def test_recorre_arbol_iter():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    config = Config()
+    config.algoritmo = "bfs"
+    config.verbose = False
+    config.heuristicas = ["manhattan"]
+    config.observador_cada = 5
+    eventos = list(recorre_arbol_iter(s_init, config))
+    assert eventos[-1]["tipo"] == "fin"
+    assert eventos[-1]["resultados"]["movimientos"] == "rrrd"
+    mejores = [e["h"] for e in eventos if e["tipo"] == "mejor_h"]
+    assert mejores == sorted(mejores, reverse=True) and len(set(mejores)) == len(mejores)
+    assert any(e["tipo"] == "progreso" for e in eventos)
+
+    # se puede cortar la busqueda dejando de iterar
+    eventos = recorre_arbol_iter(s_init, config)
+    assert next(eventos)["tipo"] == "mejor_h"
+    eventos.close()
+
+
+def test_presupuesto():
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+
+    for algoritmo in ["bfs", "a_star", "ida_star", "bidireccional"]:
+        config = Config()
+        config.algoritmo = algoritmo
+        config.verbose = False
+        config.heuristicas = ["manhattan"]
+        config.max_nodes = 3
+        results = recorre_arbol(s_init, config)
+        assert results["presupuesto_excedido"] == "max_nodes"
+        assert results["nodos_explorados"] == 3
+        assert not results["solucion"].is_finished()
+
+    # se devuelve el estado explorado con menor heuristica
+    config.algoritmo = "bfs"
+    results = recorre_arbol(s_init, config)
+    assert results["solucion"].get_heuristic(["manhattan"]) == results["mejor_h"]
+
+    # el portfolio devuelve el mejor estado de las estrategias que se cortaron
+    config.algoritmo = "portfolio"
+    config.portfolio = [{"algoritmo": "bfs"}, {"algoritmo": "a_star"}]
+    results = recorre_arbol(s_init, config)
+    assert results["presupuesto_excedido"] == "max_nodes"
+    assert results["solucion"].get_heuristic(["manhattan"]) == results["mejor_h"]
+    assert not results["solucion"].is_finished()
+
+    config.max_nodes = None
+    config.max_seconds = 0
+    assert recorre_arbol(s_init, config)["presupuesto_excedido"] == "max_seconds"
+    config.max_seconds = None
+    config.max_memory_mb = 0
+    assert recorre_arbol(s_init, config)["presupuesto_excedido"] == "max_memory_mb"
+    config.max_memory_mb = 10 ** 6
+    assert recorre_arbol(s_init, config)["presupuesto_excedido"] is None
+
+
+def test_trabajador():
+    import time
+    from src.trabajador import Trabajador
+
+    s_init = Sokoban()
+    s_init.parse_grid(basic_grid_with_objective)
+    config = Config()
+    config.verbose = True
+    config.heuristicas = ["manhattan"]
+
+    trabajador = Trabajador(s_init, config, {"algoritmo": "bfs", "observador_cada": 1})
+    trabajador.start()
+    eventos = []
+    while trabajador.activo:
+        eventos += trabajador.eventos()
+        time.sleep(0.01)
+    assert eventos[-1]["tipo"] == "fin"
+    assert trabajador.resultados["movimientos"] == "rrrd"
+    assert trabajador.resultados["resuelto"]
+    assert any(e["tipo"] == "progreso" for e in eventos)
+
+    # una busqueda sin limite se puede cancelar
+    s_init.parse_grid(basic_grid_with_objective.replace(".", " "))
+    trabajador = Trabajador(s_init, config, {"algoritmo": "dfs"})
+    trabajador.start()
+    trabajador.cancelar()
+    assert not trabajador.activo